@@ -549,8 +549,7 @@ def configure_adhoc_mission(mission_id) -> api.AnyMissionDescription:
 
     mission_description = api.AnyMissionDescription()
     mission_description.ad_hoc.metadata.mission_uid = mission_id
-    for task in tasks:
-        mission_description.ad_hoc.task_descriptions.append(task)
+    mission_description.ad_hoc.task_descriptions.extend(tasks)
 
     return mission_description
 
@@ -620,8 +619,7 @@ def example_adhoc_navigation_mission() -> api.AnyMissionDescription:
 
     mission_description = api.AnyMissionDescription()
     mission_description.ad_hoc.metadata.mission_uid = "Testing Mission"
-    for task in [task1, task2, task3, task4]:
-        mission_description.ad_hoc.task_descriptions.append(task)
+    mission_description.ad_hoc.task_descriptions.extend([task1, task2, task3, task4])
 
     return mission_description
 
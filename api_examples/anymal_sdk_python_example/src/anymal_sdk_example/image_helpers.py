@@ -1,17 +1,43 @@
 import numpy as np
 import cv2 as cv
 import logging
-from typing import Optional
+import threading
+from typing import Optional, Tuple
 
 import anymal_api_proto as api
 
+# Per-thread scratch buffers reused across frames of the same size (e.g. a thermal stream).
+_SCRATCH = threading.local()
 
-def convert_image_to_numpy(image: api.Image) -> np.ndarray:
+
+def _get_scratch_buffer(name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+    """
+    Get a reusable buffer of the given shape and type for the calling thread.
+    :param name: Name of the buffer, so different uses do not share memory.
+    :param shape: Shape of the buffer.
+    :param dtype: Data type of the buffer.
+    :return: Buffer, its content is undefined.
+    """
+    buffers = getattr(_SCRATCH, "buffers", None)
+    if buffers is None:
+        buffers = _SCRATCH.buffers = {}
+    key = (name, shape, np.dtype(dtype))
+    buffer = buffers.get(key)
+    if buffer is None:
+        buffer = buffers[key] = np.empty(shape, dtype=dtype)
+    return buffer
+
+
+def convert_image_to_numpy(image: api.Image, encoding_out: str = "bgr") -> np.ndarray:
     """
     Convert image to numpy.
     :param image: Input image.
+    :param encoding_out: Channel order of color output images, either "bgr" (OpenCV) or "rgb".
     :return: Numpy image.
     """
+    if encoding_out not in ("bgr", "rgb"):
+        raise RuntimeError(f"Output encoding '{encoding_out}' not supported.")
+
     # Interpret the image from the buffer.
     if image.encoding == "mono16":
         # Mono16 encoding -> uint16 data type.
@@ -21,15 +47,24 @@ def convert_image_to_numpy(image: api.Image) -> np.ndarray:
         # BGR encoding -> unit8 with 3 channels.
         np_buffer = np.frombuffer(image.data, "uint8")
         np_image = np.ndarray(shape=(image.height, image.width, 3), dtype="uint8", buffer=np_buffer)
+        if encoding_out == "rgb":
+            np_image = cv.cvtColor(np_image, cv.COLOR_BGR2RGB)
     elif image.encoding == "rgb8":
         # RGB8 encoding -> unit8 with 3 channels.
         np_buffer = np.frombuffer(image.data, "uint8")
         np_image = np.ndarray(shape=(image.height, image.width, 3), dtype="uint8", buffer=np_buffer)
-        np_image = np_image[:, :, ::-1]  # RGB to BRG
+        if encoding_out == "bgr":
+            np_image = np_image[:, :, ::-1]  # RGB to BRG
     elif image.encoding.endswith(",jpeg") or image.encoding.endswith(",jpg") or image.encoding.endswith(",png"):
         # Decode the image using OpenCV. This will by default return a BGR image.
         np_buffer = np.frombuffer(image.data, "uint8")
         np_image = cv.imdecode(np_buffer, cv.IMREAD_UNCHANGED)
+        if encoding_out == "rgb" and np_image.ndim == 3:
+            if np_image.shape[2] == 3:
+                np_image = cv.cvtColor(np_image, cv.COLOR_BGR2RGB)
+            elif np_image.shape[2] == 4:
+                # PNGs with an alpha channel decode to BGRA, the alpha is dropped like for the other encodings
+                np_image = cv.cvtColor(np_image, cv.COLOR_BGRA2RGB)
     else:
         raise RuntimeError(f"Encoding '{image.encoding}' not supported.")
 
@@ -46,10 +81,21 @@ def convert_thermal_image_to_numpy(
     """
     image = thermal_image.image
 
-    # Transform the image from mono16 to a gradient image for display.
-    np_image = convert_image_to_numpy(image)
-    # Convert to temperatures using the linear mapping.
-    np_image_temperature = np_image * thermal_image.gain + thermal_image.offset
+    if image.encoding == "mono16":
+        # View the raw counts as a 2D uint16 image without copying.
+        np_image = np.frombuffer(image.data, np.uint16).reshape(image.height, image.width)
+    else:
+        np_image = convert_image_to_numpy(image)
+    # Convert to float32 temperatures using the linear mapping. OpenCV fuses the type conversion
+    # and the affine transform into a single pass (equivalent to Mat::convertTo with alpha/beta).
+    np_image_temperature = cv.addWeighted(
+        np_image,
+        thermal_image.gain,
+        np_image,
+        0.0,
+        thermal_image.offset,
+        dtype=cv.CV_32F,
+    )
 
     return np_image_temperature
 
@@ -64,21 +110,26 @@ def convert_thermal_image_to_opencv_with_legend(
     :param thermal_image: Thermal image.
     :param temperature_image: Temperature image.
     :param inspected_max: Max temperature detected by the onboard inspection.
-    :return: Numpy gradient image
+    :return: Numpy gradient image. The buffer is reused by the next call on the same thread, copy it to keep it.
     """
     image = thermal_image.image
+    shape = temperature_image.shape[:2]
 
     # Normalize the image as the temperatures are in a narrow range.
     norm_image = cv.normalize(
         temperature_image,
-        None,
+        _get_scratch_buffer("norm", shape, np.uint8),
         alpha=0,
         beta=255,
         norm_type=cv.NORM_MINMAX,
         dtype=cv.CV_8U,
     )
     # Apply the jet color map.
-    gradient_image = cv.applyColorMap(norm_image, cv.COLORMAP_JET)
+    gradient_image = cv.applyColorMap(
+        norm_image,
+        cv.COLORMAP_JET,
+        dst=_get_scratch_buffer("gradient", shape + (3,), np.uint8),
+    )
 
     # Convert the image to temperatures and print min and max.
     # Print the min temperature.
@@ -140,7 +191,7 @@ def show_image(image: api.Image, title: str) -> None:
     :param title: Title of the window.
     :return: None
     """
-    np_image = convert_image_to_numpy(image)
+    np_image = convert_image_to_numpy(image, encoding_out="bgr")
     show_numpy_image(np_image, title)
 
 
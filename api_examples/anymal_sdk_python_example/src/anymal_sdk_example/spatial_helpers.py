@@ -14,16 +14,14 @@ def create_pose(
     qz: float,
     qw: float,
 ) -> api.Pose:
-    pose = api.Pose()
-    pose.frame_id = frame_id
-    pose.value.position.x = x
-    pose.value.position.y = y
-    pose.value.position.z = z
-    pose.value.orientation.qx = qx
-    pose.value.orientation.qy = qy
-    pose.value.orientation.qz = qz
-    pose.value.orientation.qw = qw
-    return pose
+    # Build the whole message through the generated constructors so the fields are set in one call each.
+    return api.Pose(
+        frame_id=frame_id,
+        value=api.PoseValue(
+            position=api.PositionValue(x=x, y=y, z=z),
+            orientation=api.OrientationValue(qx=qx, qy=qy, qz=qz, qw=qw),
+        ),
+    )
 
 
 def quaternion_to_euler(qx: float, qy: float, qz: float, qw: float) -> Tuple[float, float, float]:
@@ -36,8 +34,7 @@ def quaternion_to_euler(qx: float, qy: float, qz: float, qw: float) -> Tuple[flo
     roll = math.atan2(t0, t1)
 
     t2 = +2.0 * (qw * qy - qz * qx)
-    t2 = +1.0 if t2 > +1.0 else t2
-    t2 = max(t2, -1.0)
+    t2 = -1.0 if t2 < -1.0 else +1.0 if t2 > +1.0 else t2
     pitch = math.asin(t2)
 
     t3 = +2.0 * (qw * qz + qx * qy)
@@ -28,10 +28,18 @@ class DataNavigatorClient:
         self.verify_ssl = verify_ssl
         self.session = requests.Session()
         self.access_token = None
+
+        # Endpoint URLs are fixed per client, so build them once instead of on every call
+        self._auth_url = f"{self.base_url}/authentication-service/auth/login"
+        self._endpoints = {
+            name: f"{self.base_url}/data-navigator-api/{name}"
+            for name in ("inspections", "missions", "robots", "assets")
+        }
+        self._raw_data_url = f"{self._endpoints['inspections']}/raw-data/"
     
     def authenticate(self, email: str, password: str) -> bool:
         """Authenticate with the ANYmal server"""
-        auth_url = f"{self.base_url}/authentication-service/auth/login"
+        auth_url = self._auth_url
         
         payload = {"email": email, "password": password}
         headers = {"Content-Type": "application/json"}
@@ -54,7 +62,7 @@ class DataNavigatorClient:
     
     def get_inspections(self, limit: int = None, robot_name: str = None) -> Optional[Dict[str, Any]]:
         """Get inspection events"""
-        url = f"{self.base_url}/data-navigator-api/inspections"
+        url = self._endpoints['inspections']
         params = {}
         
         if limit:
@@ -75,7 +83,7 @@ class DataNavigatorClient:
     
     def get_missions(self) -> Optional[Dict[str, Any]]:
         """Get all missions"""
-        url = f"{self.base_url}/data-navigator-api/missions"
+        url = self._endpoints['missions']
         
         try:
             response = self.session.get(url, verify=self.verify_ssl, timeout=30)
@@ -90,7 +98,7 @@ class DataNavigatorClient:
     
     def get_robots(self) -> Optional[Dict[str, Any]]:
         """Get all robots"""
-        url = f"{self.base_url}/data-navigator-api/robots"
+        url = self._endpoints['robots']
         
         try:
             response = self.session.get(url, verify=self.verify_ssl, timeout=30)
@@ -105,7 +113,7 @@ class DataNavigatorClient:
     
     def get_assets(self) -> Optional[Dict[str, Any]]:
         """Get all assets"""
-        url = f"{self.base_url}/data-navigator-api/assets"
+        url = self._endpoints['assets']
         
         try:
             response = self.session.get(url, verify=self.verify_ssl, timeout=30)
@@ -120,7 +128,7 @@ class DataNavigatorClient:
     
     def download_inspection_raw_data(self, filename: str, output_dir: str = "./downloads") -> Optional[str]:
         """Download inspection raw data file"""
-        url = f"{self.base_url}/data-navigator-api/inspections/raw-data/{filename}"
+        url = self._raw_data_url + filename
         
         os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, filename)
@@ -5,40 +5,231 @@ Discovers and documents available API endpoints at the ANYmal server
 """
 
 import requests
+import argparse
+import functools
+import hashlib
 import json
 import os
-from typing import Dict, List, Any, Optional
+import re
+from typing import Dict, List, Any, Optional, Tuple
 import logging
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
+from concurrent.futures import as_completed
+import threading
 import time
 
+from http_utils import (
+    PREVIEW_CHUNK_SIZE,
+    get_executor,
+    get_session,
+    json_dumps_compact,
+    json_dumps_indented,
+    json_loads,
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Upper bound on the request rate, to stay respectful to the server while probes overlap
+MAX_PROBES_PER_SECOND = 20
+
+
+def merge_endpoints(*endpoint_lists) -> Tuple[str, ...]:
+    """Merge endpoint lists into one tuple, keeping the first occurrence of each endpoint in order"""
+    return tuple(dict.fromkeys(endpoint for endpoints in endpoint_lists for endpoint in endpoints))
+
+
+# Known endpoint patterns to try
+DATA_NAVIGATOR_ENDPOINTS = merge_endpoints([
+    # Data Navigator specific endpoints
+    "/data-navigator-api",
+    "/data-navigator-api/health",
+    "/data-navigator-api/version",
+    "/data-navigator-api/inspections",
+    "/data-navigator-api/inspections/list",
+    "/data-navigator-api/inspections/search",
+    "/data-navigator-api/inspections/raw-data",
+    "/data-navigator-api/inspections/metadata",
+    "/data-navigator-api/missions",
+    "/data-navigator-api/missions/list",
+    "/data-navigator-api/robots",
+    "/data-navigator-api/robots/list",
+    "/data-navigator-api/assets",
+    "/data-navigator-api/assets/list",
+    "/data-navigator-api/files",
+    "/data-navigator-api/files/list",
+    "/data-navigator-api/files/upload",
+    "/data-navigator-api/files/download",
+    
+    # General API endpoints
+    "/api",
+    "/api/v1",
+    "/api/v2",
+    "/api/health",
+    "/api/version",
+    "/api/status",
+    
+    # ANYmal API endpoints
+    "/anymal-api",
+    "/anymal-api/health",
+    "/anymal-api/version",
+    "/anymal-api/liveview",
+    "/anymal-api/liveview/token",
+    "/anymal-api/liveview/sources",
+    "/anymal-api/liveview/tracks",
+    
+    # Authentication endpoints
+    "/authentication-service",
+    "/authentication-service/health",
+    "/authentication-service/auth",
+    "/authentication-service/auth/login",
+    "/authentication-service/auth/logout",
+    "/authentication-service/auth/refresh",
+    
+    # Common API discovery endpoints
+    "/swagger",
+    "/swagger-ui",
+    "/docs",
+    "/api-docs",
+    "/openapi.json",
+    "/swagger.json",
+    "/.well-known/openapi",
+    "/redoc",
+    "/graphql",
+    "/health",
+    "/status",
+    "/version",
+    "/info",
+])
+
+# Endpoint type keywords, one named group per analysis category. The lookaheads keep the priority of the
+# categories (the first alternative whose keyword occurs anywhere in the endpoint wins) in a single scan.
+ENDPOINT_CATEGORY_PATTERN = re.compile(
+    r"^(?:"
+    r"(?=.*?data-navigator)(?P<data_navigator>)"
+    r"|(?=.*?anymal-api)(?P<anymal_api>)"
+    r"|(?=.*?authentication)(?P<authentication>)"
+    r"|(?=.*?(?:swagger|docs|openapi|redoc))(?P<documentation>)"
+    r"|(?=.*?(?:health|status|version|info))(?P<health_status>)"
+    r")"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def categorize_endpoint(endpoint: str) -> Optional[str]:
+    """Get the analysis category of an endpoint type, or None. Cached, since the probed endpoints are fixed."""
+    match = ENDPOINT_CATEGORY_PATTERN.search(endpoint)
+    return match.lastgroup if match else None
+
+
+# Endpoints that must not be probed with HEAD (they only accept specific methods)
+NO_HEAD_ENDPOINTS = frozenset([
+    "/authentication-service/auth/login",
+    "/authentication-service/auth/logout",
+    "/authentication-service/auth/refresh",
+    "/graphql",
+])
+
+
+class ProbeCache:
+    """On-disk cache of GET probe results, reused while fresh and revalidated with ETag/Last-Modified"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+    
+    @staticmethod
+    def _headers(result: Dict[str, Any]) -> requests.structures.CaseInsensitiveDict:
+        """Get the headers of a probe result, looked up case-insensitively as servers and proxies differ in case"""
+        return requests.structures.CaseInsensitiveDict(result.get('headers', {}))
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get the cached result for a URL, if any"""
+        with self._lock:
+            entry = self._entries.get(url)
+        return dict(entry['result']) if entry else None
+    
+    def is_fresh(self, url: str) -> bool:
+        """Whether the cached result is still within the max-age announced by the server"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry:
+            return False
+        cache_control = self._headers(entry['result']).get('Cache-Control', '')
+        match = re.search(r"max-age=(\d+)", cache_control)
+        if not match or 'no-cache' in cache_control or 'no-store' in cache_control:
+            return False
+        return time.time() < entry['stored_at'] + int(match.group(1))
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Get the validators of the cached result, so an unchanged resource is answered with 304"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry:
+            return {}
+        cached_headers = self._headers(entry['result'])
+        headers = {}
+        if 'ETag' in cached_headers:
+            headers['If-None-Match'] = cached_headers['ETag']
+        if 'Last-Modified' in cached_headers:
+            headers['If-Modified-Since'] = cached_headers['Last-Modified']
+        return headers
+    
+    def store(self, url: str, result: Dict[str, Any]):
+        """Cache a probe result if the server sent validators or a max-age for it"""
+        headers = self._headers(result)
+        if 'ETag' in headers or 'Last-Modified' in headers or 'max-age' in headers.get('Cache-Control', ''):
+            with self._lock:
+                self._entries[url] = {'stored_at': time.time(), 'result': result}
+    
+    def save(self):
+        """Write the cache to disk"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._lock:
+            with open(self.path, 'w') as f:
+                f.write(json_dumps_compact(self._entries))
+
+
+class RateLimiter:
+    """Thread-safe gate that spaces calls out to at most `rate` per second"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_time = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Block until the caller may issue its next request"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next_time, now)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
 class DataNavigatorAPIDiscovery:
     """Tool to discover ANYmal Data Navigator API endpoints"""
     
-    def __init__(self, server_url: str, verify_ssl: bool = True):
+    def __init__(self, server_url: str, verify_ssl: bool = True, session: Optional[requests.Session] = None,
+                 cache_path: Optional[str] = None):
         # Clean up server URL
         if server_url.startswith('http'):
             self.base_url = server_url.rstrip('/')
         else:
             self.base_url = f"https://{server_url.strip('api-').rstrip('/')}"
         self.verify_ssl = verify_ssl
-        self.session = requests.Session()
+        self.session = session if session is not None else get_session()
         self.access_token = None
-        
-        # Configure session with retries
-        adapter = requests.adapters.HTTPAdapter(
-            max_retries=requests.adapters.Retry(
-                total=3,
-                backoff_factor=0.3,
-                status_forcelist=[500, 502, 503, 504]
-            )
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        self.rate_limiter = RateLimiter(MAX_PROBES_PER_SECOND)
+        self.cache = ProbeCache(cache_path) if cache_path else None
+        self.body_store: Dict[str, str] = {}
     
     def authenticate(self, email: str, password: str) -> bool:
         """Authenticate with the ANYmal server"""
@@ -49,14 +240,10 @@ class DataNavigatorAPIDiscovery:
             "password": password
         }
         
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
         try:
+            # json= already sets the Content-Type header, no extra per-request headers are needed
             response = self.session.post(
                 auth_url, 
-                headers=headers, 
                 json=payload, 
                 verify=self.verify_ssl,
                 timeout=30
@@ -66,10 +253,8 @@ class DataNavigatorAPIDiscovery:
                 data = response.json()
                 self.access_token = data.get("accessToken")
                 
-                # Set default authorization header
-                self.session.headers.update({
-                    "Authorization": f"Bearer {self.access_token}"
-                })
+                # Set the authorization header once as a session default for all probes
+                self.session.headers["Authorization"] = f"Bearer {self.access_token}"
                 
                 logger.info("✅ Authentication successful")
                 return True
@@ -83,41 +268,79 @@ class DataNavigatorAPIDiscovery:
     
     def probe_endpoint(self, endpoint: str, method: str = "GET", data: Dict = None) -> Dict[str, Any]:
         """Probe a specific endpoint and return response information"""
-        url = urljoin(self.base_url, endpoint)
+        # Every probed endpoint is an absolute path, so plain concatenation is enough
+        url = self.base_url + endpoint
+        cache = self.cache if method.upper() == "GET" else None
+        if cache and cache.is_fresh(url):
+            return cache.get(url)
+        headers = cache.conditional_headers(url) if cache else {}
         
+        self.rate_limiter.wait()
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url, verify=self.verify_ssl, timeout=10)
-            elif method.upper() == "POST":
-                response = self.session.post(url, json=data, verify=self.verify_ssl, timeout=10)
-            elif method.upper() == "PUT":
-                response = self.session.put(url, json=data, verify=self.verify_ssl, timeout=10)
-            elif method.upper() == "DELETE":
-                response = self.session.delete(url, verify=self.verify_ssl, timeout=10)
+            response = None
+            if method.upper() == "GET" and endpoint not in NO_HEAD_ENDPOINTS:
+                # Check existence with HEAD first so 401/404 bodies are never transferred or parsed
+                response = self.session.head(
+                    url, headers=headers, verify=self.verify_ssl, timeout=10, allow_redirects=True
+                )
+                if response.status_code < 300 or response.status_code in (405, 501):
+                    # Accessible (or HEAD not supported): fetch the body for the preview
+                    response = None
+            
+            if response is None:
+                # requests ignores json=None, so one call covers every method
+                response = self.session.request(
+                    method.upper(), url, headers=headers, json=data, verify=self.verify_ssl, timeout=10, stream=True
+                )
+            
+            if response.status_code == 304 and cache:
+                # Unchanged since the last run: reuse the cached result without transferring the body
+                response.close()
+                return cache.get(url)
+            
+            content_type = response.headers.get('Content-Type', '')
+            is_json = 'application/json' in content_type
+            fully_read = False
+            # The method that produced the status, which is HEAD when the existence check already answered
+            probed_method = response.request.method
+            if probed_method == "HEAD":
+                body = b''
+            elif is_json:
+                body = response.content
+                fully_read = True
             else:
-                response = self.session.request(method, url, verify=self.verify_ssl, timeout=10)
+                # Only a preview of non-JSON bodies is kept, so stop reading after the first chunk
+                body = next(response.iter_content(PREVIEW_CHUNK_SIZE), b'')
+                response.close()
             
             result = {
                 'endpoint': endpoint,
-                'method': method,
+                'method': probed_method,
                 'status_code': response.status_code,
                 'status_text': response.reason,
                 'headers': dict(response.headers),
                 'accessible': response.status_code < 400,
                 'requires_auth': response.status_code == 401,
-                'content_type': response.headers.get('Content-Type', ''),
-                'response_size': len(response.content)
+                'content_type': content_type,
+                'response_size': len(body) if fully_read else int(response.headers.get('Content-Length', len(body)))
             }
             
             # Try to parse JSON response
             try:
-                if 'application/json' in response.headers.get('Content-Type', ''):
-                    result['json_response'] = response.json()
+                if is_json and body:
+                    result['json_response'] = json_loads(body)
                 else:
-                    result['text_response'] = response.text[:500]  # First 500 chars
-            except:
-                result['text_response'] = response.text[:200] if response.text else ''
+                    result['text_response'] = body[:500].decode('utf-8', 'replace')  # First 500 bytes
+            except ValueError:
+                result['text_response'] = body[:200].decode('utf-8', 'replace')
             
+            if 'text_response' in result and body:
+                # Many endpoints answer with the same error page; keep one copy per distinct body
+                result['body_hash'] = hashlib.blake2b(body, digest_size=8).hexdigest()
+                self.body_store.setdefault(result['body_hash'], result['text_response'])
+            
+            if cache:
+                cache.store(url, result)
             return result
             
         except requests.exceptions.RequestException as e:
@@ -128,85 +351,39 @@ class DataNavigatorAPIDiscovery:
                 'accessible': False
             }
     
-    def discover_data_navigator_endpoints(self) -> Dict[str, Any]:
-        """Discover Data Navigator API endpoints"""
+    def probe_endpoints(self, endpoints: Tuple[str, ...], method: str = "GET",
+                        ndjson_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Probe a batch of endpoints concurrently and return the results keyed by endpoint
         
-        logger.info("🔍 Discovering Data Navigator API endpoints...")
+        If ndjson_path is given, each result is also appended to that file as one JSON line as soon as
+        its probe completes, so partial results survive an interrupted run.
+        """
+        ndjson_file = open(ndjson_path, 'w') if ndjson_path else None
         
-        # Known endpoint patterns to try
-        endpoints_to_probe = [
-            # Data Navigator specific endpoints
-            "/data-navigator-api",
-            "/data-navigator-api/health",
-            "/data-navigator-api/version",
-            "/data-navigator-api/inspections",
-            "/data-navigator-api/inspections/list",
-            "/data-navigator-api/inspections/search",
-            "/data-navigator-api/inspections/raw-data",
-            "/data-navigator-api/inspections/metadata",
-            "/data-navigator-api/missions",
-            "/data-navigator-api/missions/list",
-            "/data-navigator-api/robots",
-            "/data-navigator-api/robots/list",
-            "/data-navigator-api/assets",
-            "/data-navigator-api/assets/list",
-            "/data-navigator-api/files",
-            "/data-navigator-api/files/list",
-            "/data-navigator-api/files/upload",
-            "/data-navigator-api/files/download",
-            
-            # General API endpoints
-            "/api",
-            "/api/v1",
-            "/api/v2",
-            "/api/health",
-            "/api/version",
-            "/api/status",
-            
-            # ANYmal API endpoints
-            "/anymal-api",
-            "/anymal-api/health",
-            "/anymal-api/version",
-            "/anymal-api/liveview",
-            "/anymal-api/liveview/token",
-            "/anymal-api/liveview/sources",
-            "/anymal-api/liveview/tracks",
-            
-            # Authentication endpoints
-            "/authentication-service",
-            "/authentication-service/health",
-            "/authentication-service/auth",
-            "/authentication-service/auth/login",
-            "/authentication-service/auth/logout",
-            "/authentication-service/auth/refresh",
-            
-            # Common API discovery endpoints
-            "/swagger",
-            "/swagger-ui",
-            "/docs",
-            "/api-docs",
-            "/openapi.json",
-            "/swagger.json",
-            "/.well-known/openapi",
-            "/redoc",
-            "/graphql",
-            "/health",
-            "/status",
-            "/version",
-            "/info"
-        ]
+        # Probe concurrently so the total time is bounded by the slowest responses rather than their sum
+        try:
+            executor = get_executor()
+            futures = [executor.submit(self.probe_endpoint, endpoint, method) for endpoint in endpoints]
+            for future in as_completed(futures):
+                result = future.result()
+                logger.debug(f"🔍 Probed: {result['endpoint']}")
+                if ndjson_file:
+                    ndjson_file.write(json_dumps_compact(result) + "\n")
+        finally:
+            if ndjson_file:
+                ndjson_file.close()
+            if self.cache:
+                self.cache.save()
         
-        results = {}
+        # Keep the probing order for the report
+        return {endpoint: future.result() for endpoint, future in zip(endpoints, futures)}
+    
+    def discover_data_navigator_endpoints(self, ndjson_path: Optional[str] = None) -> Dict[str, Any]:
+        """Discover Data Navigator API endpoints"""
         
-        for endpoint in endpoints_to_probe:
-            logger.info(f"🔍 Probing: {endpoint}")
-            result = self.probe_endpoint(endpoint)
-            results[endpoint] = result
-            
-            # Small delay to be respectful to the server
-            time.sleep(0.1)
+        logger.info("🔍 Discovering Data Navigator API endpoints...")
         
-        return results
+        return self.probe_endpoints(DATA_NAVIGATOR_ENDPOINTS, ndjson_path=ndjson_path)
     
     def analyze_results(self, results: Dict[str, Any]) -> Dict[str, List[str]]:
         """Analyze discovery results and categorize endpoints"""
@@ -240,40 +417,33 @@ class DataNavigatorAPIDiscovery:
                 analysis['server_error'].append(endpoint)
             
             # Categorize by endpoint type
-            if 'data-navigator' in endpoint:
-                analysis['data_navigator'].append(endpoint)
-            elif 'anymal-api' in endpoint:
-                analysis['anymal_api'].append(endpoint)
-            elif 'authentication' in endpoint:
-                analysis['authentication'].append(endpoint)
-            elif any(doc in endpoint for doc in ['swagger', 'docs', 'openapi', 'redoc']):
-                analysis['documentation'].append(endpoint)
-            elif any(health in endpoint for health in ['health', 'status', 'version', 'info']):
-                analysis['health_status'].append(endpoint)
+            category = categorize_endpoint(endpoint)
+            if category:
+                analysis[category].append(endpoint)
         
         return analysis
     
     def generate_report(self, results: Dict[str, Any], analysis: Dict[str, List[str]]) -> str:
         """Generate a comprehensive API discovery report"""
         
-        report = []
-        report.append("=" * 80)
-        report.append("🔍 ANYmal Data Navigator API Discovery Report")
-        report.append("=" * 80)
-        report.append(f"Server: {self.base_url}")
-        report.append(f"Total endpoints probed: {len(results)}")
-        report.append("")
-        
         # Summary statistics
         accessible_count = len(analysis['accessible'])
         auth_required_count = len(analysis['requires_auth'])
         not_found_count = len(analysis['not_found'])
         
-        report.append("📊 Summary:")
-        report.append(f"  ✅ Accessible: {accessible_count}")
-        report.append(f"  🔐 Requires Auth: {auth_required_count}")
-        report.append(f"  ❌ Not Found: {not_found_count}")
-        report.append("")
+        report = [
+            "=" * 80,
+            "🔍 ANYmal Data Navigator API Discovery Report",
+            "=" * 80,
+            f"Server: {self.base_url}",
+            f"Total endpoints probed: {len(results)}",
+            "",
+            "📊 Summary:",
+            f"  ✅ Accessible: {accessible_count}",
+            f"  🔐 Requires Auth: {auth_required_count}",
+            f"  ❌ Not Found: {not_found_count}",
+            "",
+        ]
         
         # Accessible endpoints
         if analysis['accessible']:
@@ -292,41 +462,28 @@ class DataNavigatorAPIDiscovery:
         # Authentication required endpoints
         if analysis['requires_auth']:
             report.append("🔐 AUTHENTICATION REQUIRED:")
-            for endpoint in analysis['requires_auth']:
-                result = results[endpoint]
-                report.append(f"  {endpoint} - {result['status_code']} {result.get('status_text', '')}")
-            report.append("")
-        
-        # Data Navigator specific endpoints
-        if analysis['data_navigator']:
-            report.append("🗂️  DATA NAVIGATOR ENDPOINTS:")
-            for endpoint in analysis['data_navigator']:
-                result = results[endpoint]
-                status = result.get('status_code', 'error')
-                report.append(f"  {endpoint} - {status}")
-            report.append("")
-        
-        # ANYmal API endpoints
-        if analysis['anymal_api']:
-            report.append("🤖 ANYMAL API ENDPOINTS:")
-            for endpoint in analysis['anymal_api']:
-                result = results[endpoint]
-                status = result.get('status_code', 'error')
-                report.append(f"  {endpoint} - {status}")
+            report.extend(
+                f"  {endpoint} - {results[endpoint]['status_code']} {results[endpoint].get('status_text', '')}"
+                for endpoint in analysis['requires_auth']
+            )
             report.append("")
         
-        # Documentation endpoints
-        if analysis['documentation']:
-            report.append("📚 DOCUMENTATION ENDPOINTS:")
-            for endpoint in analysis['documentation']:
-                result = results[endpoint]
-                status = result.get('status_code', 'error')
-                report.append(f"  {endpoint} - {status}")
-            report.append("")
+        # Data Navigator, ANYmal API and documentation endpoints
+        for category, title in (
+            ('data_navigator', "🗂️  DATA NAVIGATOR ENDPOINTS:"),
+            ('anymal_api', "🤖 ANYMAL API ENDPOINTS:"),
+            ('documentation', "📚 DOCUMENTATION ENDPOINTS:"),
+        ):
+            if analysis[category]:
+                report.append(title)
+                report.extend(
+                    f"  {endpoint} - {results[endpoint].get('status_code', 'error')}"
+                    for endpoint in analysis[category]
+                )
+                report.append("")
         
         # Detailed results for interesting endpoints
-        report.append("🔍 DETAILED ENDPOINT ANALYSIS:")
-        report.append("")
+        report.extend(["🔍 DETAILED ENDPOINT ANALYSIS:", ""])
         
         interesting_endpoints = (
             analysis['accessible'] + 
@@ -339,12 +496,14 @@ class DataNavigatorAPIDiscovery:
             if result.get('error'):
                 continue
                 
-            report.append(f"Endpoint: {endpoint}")
-            report.append(f"  Status: {result.get('status_code')} {result.get('status_text', '')}")
-            report.append(f"  Content-Type: {result.get('content_type', 'unknown')}")
+            report.extend([
+                f"Endpoint: {endpoint}",
+                f"  Status: {result.get('status_code')} {result.get('status_text', '')}",
+                f"  Content-Type: {result.get('content_type', 'unknown')}",
+            ])
             
             if 'json_response' in result:
-                json_str = json.dumps(result['json_response'], indent=2)[:300]
+                json_str = json_dumps_indented(result['json_response'])[:300]
                 report.append(f"  Response: {json_str}...")
             elif 'text_response' in result and result['text_response']:
                 report.append(f"  Response: {result['text_response'][:200]}...")
@@ -354,15 +513,40 @@ class DataNavigatorAPIDiscovery:
         return "\n".join(report)
     
     def save_detailed_results(self, results: Dict[str, Any], filename: str = "api_discovery_results.json"):
-        """Save detailed results to JSON file"""
+        """Save detailed results to JSON file
+        
+        Text bodies are written once to a side file (<filename stem>_bodies.json) and referenced from the
+        results by their body_hash, so identical error pages are not repeated for every endpoint.
+        """
+        bodies = {}
+        deduplicated = {}
+        for endpoint, result in results.items():
+            body_hash = result.get('body_hash')
+            if body_hash in self.body_store:
+                bodies[body_hash] = self.body_store[body_hash]
+                result = {key: value for key, value in result.items() if key != 'text_response'}
+            deduplicated[endpoint] = result
+        
         with open(filename, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+            f.write(json_dumps_indented(deduplicated))
         logger.info(f"💾 Detailed results saved to: {filename}")
+        
+        if bodies:
+            bodies_filename = f"{os.path.splitext(filename)[0]}_bodies.json"
+            with open(bodies_filename, 'w') as f:
+                f.write(json_dumps_indented(bodies))
+            logger.info(f"💾 Response bodies saved to: {bodies_filename}")
 
 
 def main():
     """Main discovery function"""
     
+    parser = argparse.ArgumentParser(description="Discover ANYmal Data Navigator API endpoints")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every probed endpoint")
+    args = parser.parse_args()
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+    
     # Get credentials from environment variables
     server_url = os.getenv("ANYMAL_SERVER_URL", "raas-ge-ver.prod.anybotics.com")
     email = os.getenv("ANYMAL_EMAIL")
@@ -373,15 +557,15 @@ def main():
         return
     
     # Initialize discovery tool
-    discovery = DataNavigatorAPIDiscovery(server_url, verify_ssl=True)
+    discovery = DataNavigatorAPIDiscovery(server_url, verify_ssl=True, cache_path=".cache/http/probe_cache.json")
     
     # Authenticate
     if not discovery.authenticate(email, password):
         logger.error("❌ Authentication failed. Cannot proceed with API discovery.")
         return
     
-    # Discover endpoints
-    results = discovery.discover_data_navigator_endpoints()
+    # Discover endpoints, streaming each result to disk as it arrives
+    results = discovery.discover_data_navigator_endpoints(ndjson_path="api_discovery_results.ndjson")
     
     # Analyze results
     analysis = discovery.analyze_results(results)
@@ -399,6 +583,7 @@ def main():
     
     logger.info("📋 Report saved to: data_navigator_api_report.txt")
     logger.info("💾 Detailed JSON results saved to: api_discovery_results.json")
+    logger.info("💾 Per-endpoint results streamed to: api_discovery_results.ndjson")
 
 
 if __name__ == "__main__":
@@ -2,15 +2,102 @@
 """
 Discover service endpoints by testing common service patterns
 """
-import requests
+import argparse
 import json
 import os
-from urllib.parse import urljoin
+
+from discover_data_navigator_api import (
+    DATA_NAVIGATOR_ENDPOINTS,
+    MAX_PROBES_PER_SECOND,
+    RateLimiter,
+    merge_endpoints,
+)
+from http_utils import get_executor, get_session
+
+# Common service endpoint patterns to test
+SERVICE_PATTERNS = merge_endpoints([
+    # Authentication and user services
+    "/authentication-service/auth/profile",
+    "/authentication-service/auth/refresh",
+    "/authentication-service/users/me",
+    "/user-service/profile",
+    "/user-service/preferences",
+    
+    # Known working data navigator
+    "/data-navigator-api/inspections",
+    "/data-navigator-api/missions",
+    "/data-navigator-api/robots", 
+    "/data-navigator-api/assets",
+    
+    # Workforce services (we know these exist but need different auth)
+    "/workforce-service/inspections",
+    "/workforce-service/missions",
+    "/workforce-service/robots",
+    "/workforce-service/dashboard",
+    
+    # Fleet management
+    "/fleet-service/robots",
+    "/fleet-service/status",
+    "/fleet-service/missions",
+    
+    # Analytics and reporting
+    "/analytics-service/inspections",
+    "/analytics-service/reports",
+    "/analytics-service/dashboard",
+    "/reporting-service/generate",
+    "/reporting-service/templates",
+    
+    # File and media services
+    "/file-service/upload",
+    "/file-service/download", 
+    "/media-service/images",
+    "/media-service/videos",
+    
+    # Configuration and settings
+    "/config-service/settings",
+    "/settings-service/user",
+    "/preferences-service/user",
+    
+    # Notification services
+    "/notification-service/alerts",
+    "/alert-service/notifications",
+    
+    # API documentation endpoints
+    "/api/docs",
+    "/api/swagger",
+    "/api/openapi",
+    "/docs",
+    "/swagger",
+    "/openapi.json",
+    "/api-docs",
+    
+    # Health and status endpoints
+    "/health",
+    "/status",
+    "/ping",
+    "/version",
+    "/info",
+    
+    # Alternative API patterns
+    "/api/v1/inspections",
+    "/api/v1/missions",
+    "/api/v1/robots",
+    "/api/v1/assets",
+    "/v1/inspections",
+    "/v1/missions",
+    "/v1/robots",
+    "/v1/assets",
+])
+
+# Targets of both discovery scripts in one batch, so the endpoints they share are only probed once
+ALL_DISCOVERY_ENDPOINTS = merge_endpoints(DATA_NAVIGATOR_ENDPOINTS, SERVICE_PATTERNS)
+
 
 def authenticate():
     """Authenticate and get token"""
     base_url = "https://raas-ge-ver.prod.anybotics.com"
-    session = requests.Session()
+    # Shared with the Data Navigator discovery, so both passes reuse the same pooled connections
+    session = get_session()
     
     email = os.getenv('ANYMAL_EMAIL')
     password = os.getenv('ANYMAL_PASSWORD')
@@ -24,14 +111,15 @@ def authenticate():
     if response.status_code in [200, 201]:
         auth_result = response.json()
         token = auth_result.get('accessToken')
-        session.headers.update({'Authorization': f'Bearer {token}'})
+        # Set the authorization header once as a session default for all probes
+        session.headers['Authorization'] = f'Bearer {token}'
         print(f"✅ Authentication successful")
         return session, base_url
     else:
         print(f"❌ Authentication failed: {response.status_code}")
         return None, None
 
-def discover_service_patterns():
+def discover_service_patterns(endpoints=SERVICE_PATTERNS):
     """Discover various service endpoint patterns"""
     session, base_url = authenticate()
     if not session:
@@ -39,97 +127,36 @@ def discover_service_patterns():
     
     print("\n🔍 Discovering service endpoints...")
     
-    # Test various service patterns
-    service_patterns = [
-        # Authentication and user services
-        "/authentication-service/auth/profile",
-        "/authentication-service/auth/refresh",
-        "/authentication-service/users/me",
-        "/user-service/profile",
-        "/user-service/preferences",
-        
-        # Known working data navigator
-        "/data-navigator-api/inspections",
-        "/data-navigator-api/missions",
-        "/data-navigator-api/robots", 
-        "/data-navigator-api/assets",
-        
-        # Workforce services (we know these exist but need different auth)
-        "/workforce-service/inspections",
-        "/workforce-service/missions",
-        "/workforce-service/robots",
-        "/workforce-service/dashboard",
-        
-        # Fleet management
-        "/fleet-service/robots",
-        "/fleet-service/status",
-        "/fleet-service/missions",
-        
-        # Analytics and reporting
-        "/analytics-service/inspections",
-        "/analytics-service/reports",
-        "/analytics-service/dashboard",
-        "/reporting-service/generate",
-        "/reporting-service/templates",
-        
-        # File and media services
-        "/file-service/upload",
-        "/file-service/download", 
-        "/media-service/images",
-        "/media-service/videos",
-        
-        # Configuration and settings
-        "/config-service/settings",
-        "/settings-service/user",
-        "/preferences-service/user",
-        
-        # Notification services
-        "/notification-service/alerts",
-        "/alert-service/notifications",
-        
-        # API documentation endpoints
-        "/api/docs",
-        "/api/swagger",
-        "/api/openapi",
-        "/docs",
-        "/swagger",
-        "/openapi.json",
-        "/api-docs",
-        
-        # Health and status endpoints
-        "/health",
-        "/status",
-        "/ping",
-        "/version",
-        "/info",
-        
-        # Alternative API patterns
-        "/api/v1/inspections",
-        "/api/v1/missions",
-        "/api/v1/robots",
-        "/api/v1/assets",
-        "/v1/inspections",
-        "/v1/missions",
-        "/v1/robots",
-        "/v1/assets",
-    ]
-    
     working_endpoints = []
     auth_required_endpoints = []
     
-    for endpoint in service_patterns:
+    rate_limiter = RateLimiter(MAX_PROBES_PER_SECOND)
+    
+    def fetch(endpoint):
+        rate_limiter.wait()
         try:
-            url = urljoin(base_url, endpoint)
-            print(f"🔍 Testing: {endpoint}")
-            
-            response = session.get(url, timeout=5)
+            # Every probed endpoint is an absolute path, so plain concatenation is enough
+            return session.get(base_url + endpoint, timeout=5), None
+        except Exception as e:
+            return None, e
+    
+    # Issue the requests concurrently; results come back in the original order for reporting
+    responses = list(get_executor().map(fetch, endpoints))
+    
+    # Collect the per-endpoint lines and write them out in one go instead of one print per line
+    pending = []
+    for endpoint, (response, error) in zip(endpoints, responses):
+        try:
+            pending.append(f"🔍 Testing: {endpoint}")
+            if error:
+                raise error
             
             if response.status_code == 200:
                 try:
                     data = response.json()
                     data_preview = str(data)[:150] + "..." if len(str(data)) > 150 else str(data)
-                    print(f"   ✅ Working: {response.status_code}")
-                    print(f"      📄 {data_preview}")
+                    pending.append(f"   ✅ Working: {response.status_code}")
+                    pending.append(f"      📄 {data_preview}")
                     working_endpoints.append({
                         'endpoint': endpoint,
                         'status': response.status_code,
@@ -138,8 +165,8 @@ def discover_service_patterns():
                     })
                 except:
                     content_preview = response.text[:150] + "..." if len(response.text) > 150 else response.text
-                    print(f"   ✅ Working: {response.status_code} (non-JSON)")
-                    print(f"      📄 {content_preview}")
+                    pending.append(f"   ✅ Working: {response.status_code} (non-JSON)")
+                    pending.append(f"      📄 {content_preview}")
                     working_endpoints.append({
                         'endpoint': endpoint,
                         'status': response.status_code,
@@ -147,19 +174,21 @@ def discover_service_patterns():
                         'content_type': response.headers.get('content-type', '')
                     })
             elif response.status_code in [401, 403]:
-                print(f"   🔐 Auth required: {response.status_code}")
+                pending.append(f"   🔐 Auth required: {response.status_code}")
                 auth_required_endpoints.append({
                     'endpoint': endpoint,
                     'status': response.status_code,
                     'note': 'Authentication/Authorization required'
                 })
             elif response.status_code == 404:
-                print(f"   ❌ Not found: {response.status_code}")
+                pending.append(f"   ❌ Not found: {response.status_code}")
             else:
-                print(f"   ⚠️  Status: {response.status_code}")
+                pending.append(f"   ⚠️  Status: {response.status_code}")
                 
         except Exception as e:
-            print(f"   ❌ Error: {str(e)}")
+            pending.append(f"   ❌ Error: {str(e)}")
+    
+    print("\n".join(pending))
     
     # Report results
     print(f"\n📊 DISCOVERY RESULTS:")
@@ -203,5 +232,10 @@ def discover_service_patterns():
     return working_endpoints, auth_required_endpoints
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Discover ANYmal service endpoints")
+    parser.add_argument("--all", action="store_true",
+                        help="also probe the Data Navigator endpoints, in the same batch and each only once")
+    args = parser.parse_args()
+    
     print("🚀 Starting Service Endpoint Discovery...")
-    discover_service_patterns()
\ No newline at end of file
+    discover_service_patterns(ALL_DISCOVERY_ENDPOINTS if args.all else SERVICE_PATTERNS)
\ No newline at end of file
@@ -2,18 +2,44 @@
 """
 Discover additional API endpoints by analyzing the Data Navigator web portal
 """
-import requests
-import json
 import os
-from urllib.parse import urljoin, urlparse
-import re
+
+from http_utils import (
+    JSON_HEADERS,
+    create_session,
+    get_executor,
+    json_dumps_compact,
+    json_dumps_indented,
+    release_response,
+)
+from endpoint_utils import PAGE_HEADERS, compile_api_patterns, find_api_endpoints, fingerprint
+
+# Patterns for API calls in JavaScript, each with exactly one capturing group for the endpoint
+API_PATTERNS = (
+    r'["\']([^"\']*(?:api|service)[^"\']*)["\']',  # Generic API paths
+    r'fetch\(["\']([^"\']+)["\']',  # Fetch calls
+    r'axios\.(?:get|post|put|delete)\(["\']([^"\']+)["\']',  # Axios calls
+    r'\.(?:get|post|put|delete)\(["\']([^"\']+)["\']',  # HTTP method calls
+    r'endpoint["\']?\s*[:=]\s*["\']([^"\']+)["\']',  # Endpoint definitions
+    r'url["\']?\s*[:=]\s*["\']([^"\']+)["\']',  # URL definitions
+    r'(/[a-zA-Z0-9-]+(?:-api|service)/[^"\'\s<>]+)',  # Direct API path patterns
+)
+
+# Compiled once, every page is scanned with each pattern
+COMPILED_API_PATTERNS = compile_api_patterns(API_PATTERNS)
+
+# Only the first part of a portal page is scanned; the script tags with API constants live near the top
+MAX_PAGE_SIZE = 1024 * 1024
 
 class WebPortalAPIDiscovery:
     def __init__(self):
         self.base_url = "https://raas-ge-ver.prod.anybotics.com"
-        self.session = requests.Session()
+        self.session = create_session()
+        self.auth_url = f"{self.base_url}/authentication-service/auth/login"
+        self.auth_body = None
         self.token = None
-        self.discovered_endpoints = set()
+        # Insertion-ordered set, endpoints are only sorted for the saved report
+        self.discovered_endpoints = {}
         
     def authenticate(self):
         """Authenticate and get token"""
@@ -23,11 +49,12 @@ class WebPortalAPIDiscovery:
         if not email or not password:
             raise ValueError("Please set ANYBOTICS_EMAIL and ANYBOTICS_PASSWORD environment variables")
         
-        auth_url = f"{self.base_url}/authentication-service/auth/login"
-        auth_data = {"email": email, "password": password}
+        # Serialize the credentials once, so a later re-authentication posts the same body as is
+        if self.auth_body is None:
+            self.auth_body = json_dumps_compact({"email": email, "password": password}).encode()
         
         print("🔐 Authenticating...")
-        response = self.session.post(auth_url, json=auth_data)
+        response = self.session.post(self.auth_url, data=self.auth_body, headers=JSON_HEADERS)
         
         if response.status_code == 200:
             auth_result = response.json()
@@ -54,74 +81,75 @@ class WebPortalAPIDiscovery:
         
         print("\n🌐 Fetching web portal pages...")
         
-        for page in pages_to_check:
+        # Fetch all pages concurrently; results come back in the original order for reporting
+        pages = get_executor().map(self.fetch_page, pages_to_check)
+        for page, (status_code, content_encoding, content, error) in zip(pages_to_check, pages):
             try:
-                url = urljoin(self.base_url, page)
                 print(f"📄 Checking: {page}")
+                if error:
+                    raise error
                 
-                response = self.session.get(url, timeout=10)
-                if response.status_code == 200:
-                    self.analyze_page_content(response.text, page)
-                    print(f"   ✅ Status: {response.status_code}")
+                if status_code == 200:
+                    self.analyze_page_content(content, page)
+                    # Portal pages compress well, an 'identity' encoding here means the page came uncompressed
+                    print(f"   ✅ Status: {status_code} ({content_encoding})")
                 else:
-                    print(f"   ⚠️  Status: {response.status_code}")
+                    print(f"   ⚠️  Status: {status_code}")
                     
             except Exception as e:
                 print(f"   ❌ Error: {str(e)}")
     
+    def fetch_page(self, page):
+        """Fetch a portal page, returning (status_code, content_encoding, content, error)
+        
+        The content is limited to MAX_PAGE_SIZE characters.
+        """
+        try:
+            # Stream the body so large pages are neither downloaded nor held in memory beyond the limit
+            with self.session.get(self.base_url + page, headers=PAGE_HEADERS, stream=True, timeout=10) as response:
+                content_encoding = response.headers.get('Content-Encoding', 'identity')
+                if response.status_code != 200:
+                    return response.status_code, content_encoding, None, None
+                
+                response.encoding = response.encoding or 'utf-8'
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=64 * 1024, decode_unicode=True):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= MAX_PAGE_SIZE:
+                        break
+                return response.status_code, content_encoding, "".join(chunks)[:MAX_PAGE_SIZE], None
+        except Exception as e:
+            return None, None, None, e
+    
+    def fetch_all(self, paths, timeout):
+        """Fetch the paths concurrently over the session, yielding (response, error) pairs in the order of the paths"""
+        def fetch(path):
+            try:
+                # Paths are server-relative and start with '/', so plain concatenation is enough
+                response = self.session.get(self.base_url + path, stream=True, timeout=timeout)
+                # Only the status code and size are reported, so skip downloading bodies of unsuccessful
+                # responses and of those that state their size up front
+                if response.status_code != 200 or response.headers.get('Content-Length', '').isdigit():
+                    release_response(response)
+                else:
+                    # Read the body in the worker, so the downloads stay concurrent
+                    response.content
+                return response, None
+            except Exception as e:
+                return None, e
+        
+        return get_executor().map(fetch, paths)
+    
     def analyze_page_content(self, content, page_path):
         """Analyze page content for API endpoint references"""
-        # Look for API calls in JavaScript
-        api_patterns = [
-            r'["\']([^"\']*(?:api|service)[^"\']*)["\']',  # Generic API paths
-            r'fetch\(["\']([^"\']+)["\']',  # Fetch calls
-            r'axios\.(?:get|post|put|delete)\(["\']([^"\']+)["\']',  # Axios calls
-            r'\.(?:get|post|put|delete)\(["\']([^"\']+)["\']',  # HTTP method calls
-            r'endpoint["\']?\s*[:=]\s*["\']([^"\']+)["\']',  # Endpoint definitions
-            r'url["\']?\s*[:=]\s*["\']([^"\']+)["\']',  # URL definitions
-            r'/[a-zA-Z0-9-]+(?:-api|service)/[^"\'\s<>]+',  # Direct API path patterns
-        ]
-        
-        found_endpoints = set()
-        
-        for pattern in api_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                if self.is_valid_api_endpoint(match):
-                    found_endpoints.add(match)
-        
-        # Also look for direct API references in the content
-        direct_api_matches = re.findall(r'/[a-zA-Z0-9-]+(?:-api|service)/[^"\'\s<>]+', content)
-        for match in direct_api_matches:
-            if self.is_valid_api_endpoint(match):
-                found_endpoints.add(match)
+        # Look for API calls in JavaScript and direct API references
+        found_endpoints = dict.fromkeys(find_api_endpoints(content, COMPILED_API_PATTERNS))
         
         if found_endpoints:
             print(f"   🔍 Found {len(found_endpoints)} potential endpoints")
-            for endpoint in found_endpoints:
-                self.discovered_endpoints.add(endpoint)
-    
-    def is_valid_api_endpoint(self, path):
-        """Check if a path looks like a valid API endpoint"""
-        if not path or len(path) < 5:
-            return False
-            
-        # Must contain 'api' or 'service'
-        if 'api' not in path.lower() and 'service' not in path.lower():
-            return False
-            
-        # Skip common non-API patterns
-        skip_patterns = [
-            'javascript:', 'mailto:', 'tel:', 'http://', 'https://',
-            '.css', '.js', '.png', '.jpg', '.gif', '.svg', '.ico',
-            'google', 'facebook', 'twitter', 'linkedin'
-        ]
-        
-        for skip in skip_patterns:
-            if skip in path.lower():
-                return False
-        
-        return True
+            self.discovered_endpoints.update(found_endpoints)
     
     def test_discovered_endpoints(self):
         """Test discovered endpoints to see which ones work"""
@@ -129,16 +157,22 @@ class WebPortalAPIDiscovery:
         
         working_endpoints = []
         
-        for endpoint in sorted(self.discovered_endpoints):
+        # Clean up the endpoints and test one representative per route, ID variants of a route behave alike
+        representatives = {}
+        for endpoint in self.discovered_endpoints:
+            if not endpoint.startswith('/'):
+                endpoint = '/' + endpoint
+            representatives.setdefault(fingerprint(endpoint), endpoint)
+        endpoints = list(representatives.values())
+        
+        if len(endpoints) < len(self.discovered_endpoints):
+            print(f"   Testing {len(endpoints)} distinct routes")
+        
+        for endpoint, (response, error) in zip(endpoints, self.fetch_all(endpoints, timeout=5)):
             try:
-                # Clean up the endpoint
-                if not endpoint.startswith('/'):
-                    endpoint = '/' + endpoint
-                
-                url = urljoin(self.base_url, endpoint)
                 print(f"🔍 Testing: {endpoint}")
-                
-                response = self.session.get(url, timeout=5)
+                if error:
+                    raise error
                 
                 if response.status_code == 200:
                     print(f"   ✅ Working: {response.status_code}")
@@ -146,7 +180,7 @@ class WebPortalAPIDiscovery:
                         'endpoint': endpoint,
                         'status': response.status_code,
                         'content_type': response.headers.get('content-type', ''),
-                        'size': len(response.content)
+                        'size': int(response.headers.get('Content-Length') or len(response.content))
                     })
                 elif response.status_code in [401, 403]:
                     print(f"   🔐 Auth required: {response.status_code}")
@@ -205,12 +239,12 @@ class WebPortalAPIDiscovery:
             'discovery_timestamp': '2025-01-16',
             'base_url': self.base_url,
             'total_discovered': len(self.discovered_endpoints),
-            'all_discovered_endpoints': sorted(list(self.discovered_endpoints)),
-            'working_endpoints': working_endpoints
+            'all_discovered_endpoints': sorted(self.discovered_endpoints),
+            'working_endpoints': sorted(working_endpoints, key=lambda info: info['endpoint'])
         }
         
         with open('web_portal_api_discovery_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
+            f.write(json_dumps_indented(results))
         
         print(f"\n💾 Results saved to: web_portal_api_discovery_results.json")
 
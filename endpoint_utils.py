@@ -0,0 +1,80 @@
+"""
+Helpers shared by the web portal discovery scripts to extract, validate and group API endpoints
+"""
+import functools
+import re
+
+# Headers for fetching portal pages. Compression is left to requests, which already asks for gzip and deflate,
+# plus br/zstd when their decoders are installed; advertising an encoding it cannot decode would break the scan.
+PAGE_HEADERS = {"Accept": "text/html,application/json"}
+
+# Common non-API substrings, matched in one scan of the lowercased path
+SKIP_PATTERNS = (
+    'javascript:', 'mailto:', 'tel:', 'http://', 'https://',
+    '.css', '.js', '.png', '.jpg', '.gif', '.svg', '.ico',
+    'google', 'facebook', 'twitter', 'linkedin', 'cdn'
+)
+_SKIP_RE = re.compile("|".join(re.escape(skip) for skip in SKIP_PATTERNS))
+
+# Path segments and query values that identify a single resource, replaced by a placeholder when fingerprinting
+_ID_SEGMENTS = (
+    (re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE), '{uuid}'),
+    (re.compile(r'(?=.*\d)[0-9A-HJKMNP-TV-Z]{26}', re.IGNORECASE), '{ulid}'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}(?:T[\d:.]+Z?)?'), '{date}'),
+    (re.compile(r'\d+'), '{id}'),
+    (re.compile(r'[0-9a-f]{16,}', re.IGNORECASE), '{hash}'),
+)
+
+
+def compile_api_patterns(patterns):
+    """Compile API call patterns, each with exactly one capturing group for the endpoint
+
+    The patterns stay separate rather than being joined into one alternation: their matches overlap,
+    e.g. a direct API path inside a quoted absolute URL, and an alternation would only find one of them.
+    """
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+
+def find_api_endpoints(content, patterns):
+    """Yield the valid endpoints matched by each compiled pattern in turn, in order of appearance"""
+    for pattern in patterns:
+        for match in pattern.finditer(content):
+            endpoint = match.group(1)
+            if is_valid_endpoint(endpoint):
+                yield endpoint
+
+
+@functools.lru_cache(maxsize=4096)
+def is_valid_endpoint(path):
+    """Check if a path looks like a valid API endpoint, cached as pages repeat the same literals many times"""
+    if not path or len(path) < 5:
+        return False
+
+    low = path.lower()
+
+    # Must contain api or service
+    if 'api' not in low and 'service' not in low:
+        return False
+
+    # Skip common non-API patterns
+    if _SKIP_RE.search(low):
+        return False
+
+    return True
+
+
+def _normalize_segment(segment):
+    for pattern, placeholder in _ID_SEGMENTS:
+        if pattern.fullmatch(segment):
+            return placeholder
+    return segment
+
+
+def fingerprint(endpoint):
+    """Get the route shape of an endpoint, so e.g. /robots/12/status and /robots/34/status share a fingerprint"""
+    path, _, query = endpoint.partition('?')
+    result = '/'.join(_normalize_segment(segment) for segment in path.split('/'))
+    if query:
+        params = (param.partition('=') for param in query.split('&'))
+        result += '?' + '&'.join(key + sep + _normalize_segment(value) for key, sep, value in params)
+    return result
@@ -2,27 +2,74 @@
 """
 Explore different approaches to access elevated services
 """
-import requests
 import json
 import os
-from urllib.parse import urljoin
+
+from http_utils import (
+    JSON_HEADERS,
+    create_session,
+    get_executor,
+    json_dumps_compact,
+    release_response,
+)
+
+# User info endpoints to test
+USER_ENDPOINTS = (
+    "/authentication-service/users/me",
+    "/user-service/profile",
+    "/user-service/preferences"
+)
+
+# Workforce portal pages
+PORTAL_ENDPOINTS = (
+    "/workforce/data-navigator/",
+    "/workforce/data-navigator/login",
+    "/workforce/data-navigator/dashboard",
+    "/workforce/",
+    "/workforce/login"
+)
+
+# API documentation endpoints
+DOC_ENDPOINTS = (
+    "/api/docs",
+    "/docs",
+    "/swagger",
+    "/api/swagger",
+    "/openapi.json",
+    "/api-docs",
+    "/redoc"
+)
+
+# Test if services have their own auth endpoints
+SERVICE_AUTH_PATTERNS = (
+    "/workforce-service/auth/login",
+    "/fleet-service/auth/login",
+    "/analytics-service/auth/login",
+    "/workforce-api/auth/login",
+    "/fleet-api/auth/login",
+    "/analytics-api/auth/login"
+)
 
 class ElevatedAccessExplorer:
     def __init__(self):
         self.base_url = "https://raas-ge-ver.prod.anybotics.com"
-        self.session = requests.Session()
+        self.session = create_session()
+        self.auth_url = f"{self.base_url}/authentication-service/auth/login"
+        self.auth_body = None
         self.token = None
+        self.responses = {}
         
     def authenticate(self):
         """Standard authentication"""
         email = os.getenv('ANYMAL_EMAIL')
         password = os.getenv('ANYMAL_PASSWORD')
         
-        auth_url = f"{self.base_url}/authentication-service/auth/login"
-        auth_data = {"email": email, "password": password}
+        # Serialize the credentials once, so a later re-authentication posts the same body as is
+        if self.auth_body is None:
+            self.auth_body = json_dumps_compact({"email": email, "password": password}).encode()
         
         print("🔐 Authenticating...")
-        response = self.session.post(auth_url, json=auth_data)
+        response = self.session.post(self.auth_url, data=self.auth_body, headers=JSON_HEADERS)
         
         if response.status_code in [200, 201]:
             auth_result = response.json()
@@ -37,21 +84,37 @@ class ElevatedAccessExplorer:
             print(f"❌ Authentication failed: {response.status_code}")
             return False
     
+    def fetch_all(self, endpoints, timeout=5):
+        """Fetch the endpoints concurrently over the session and return (response, error) pairs in their order
+        
+        Endpoints that were already fetched are served from self.responses, so a prefetched batch is not requested again.
+        """
+        def fetch(endpoint):
+            try:
+                # Every endpoint is an absolute path, so plain concatenation is enough
+                response = self.session.get(self.base_url + endpoint, stream=True, timeout=timeout)
+                # Bodies are only inspected for successful and forbidden responses, so skip downloading the others
+                if response.status_code not in (200, 403):
+                    release_response(response)
+                else:
+                    # Read the body in the worker, so the downloads stay concurrent
+                    response.content
+                return response, None
+            except Exception as e:
+                return None, e
+        
+        missing = [endpoint for endpoint in dict.fromkeys(endpoints) if endpoint not in self.responses]
+        self.responses.update(zip(missing, get_executor().map(fetch, missing)))
+        return [self.responses[endpoint] for endpoint in endpoints]
+    
     def analyze_token_permissions(self):
         """Analyze what the current token allows"""
         print("\n🔍 Analyzing current token permissions...")
         
-        # Test user info endpoints
-        user_endpoints = [
-            "/authentication-service/users/me",
-            "/user-service/profile", 
-            "/user-service/preferences"
-        ]
-        
-        for endpoint in user_endpoints:
+        for endpoint, (response, error) in zip(USER_ENDPOINTS, self.fetch_all(USER_ENDPOINTS)):
             try:
-                url = urljoin(self.base_url, endpoint)
-                response = self.session.get(url, timeout=5)
+                if error:
+                    raise error
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -72,7 +135,7 @@ class ElevatedAccessExplorer:
         print("\n🔧 Trying alternative authentication approaches...")
         
         test_endpoint = "/workforce-service/dashboard"
-        url = urljoin(self.base_url, test_endpoint)
+        url = self.base_url + test_endpoint
         
         # Different header approaches
         auth_approaches = [
@@ -84,21 +147,24 @@ class ElevatedAccessExplorer:
             {"Access-Token": self.token},
         ]
         
-        for i, headers in enumerate(auth_approaches, 1):
-            try:
-                print(f"🔍 Approach {i}: {list(headers.keys())[0]}")
-                response = requests.get(url, headers=headers, timeout=5)
-                
-                if response.status_code == 200:
-                    print(f"   ✅ SUCCESS! Status: {response.status_code}")
-                    return headers
-                elif response.status_code == 403:
-                    print(f"   🔐 Still forbidden: {response.status_code}")
-                else:
-                    print(f"   ⚠️  Status: {response.status_code}")
+        # A separate session without the Bearer default, so only the tested header is sent, and all attempts
+        # reuse one connection. HEAD is enough to see the status code.
+        with create_session() as probe_session:
+            for i, headers in enumerate(auth_approaches, 1):
+                try:
+                    print(f"🔍 Approach {i}: {list(headers.keys())[0]}")
+                    response = probe_session.head(url, headers=headers, allow_redirects=False, timeout=5)
                     
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
+                    if response.status_code == 200:
+                        print(f"   ✅ SUCCESS! Status: {response.status_code}")
+                        return headers
+                    elif response.status_code == 403:
+                        print(f"   🔐 Still forbidden: {response.status_code}")
+                    else:
+                        print(f"   ⚠️  Status: {response.status_code}")
+                        
+                except Exception as e:
+                    print(f"   ❌ Error: {e}")
         
         return None
     
@@ -106,21 +172,12 @@ class ElevatedAccessExplorer:
         """Try to access workforce portal with different approaches"""
         print("\n🌐 Exploring workforce portal access...")
         
-        portal_endpoints = [
-            "/workforce/data-navigator/",
-            "/workforce/data-navigator/login",
-            "/workforce/data-navigator/dashboard",
-            "/workforce/",
-            "/workforce/login"
-        ]
-        
-        for endpoint in portal_endpoints:
+        for endpoint, (response, error) in zip(PORTAL_ENDPOINTS, self.fetch_all(PORTAL_ENDPOINTS)):
             try:
-                url = urljoin(self.base_url, endpoint)
                 print(f"🔍 Testing: {endpoint}")
+                if error:
+                    raise error
                 
-                # Try GET request
-                response = self.session.get(url, timeout=5)
                 print(f"   GET: {response.status_code}")
                 
                 if response.status_code == 200:
@@ -141,22 +198,11 @@ class ElevatedAccessExplorer:
         """Check if we can access API documentation"""
         print("\n📚 Checking API documentation access...")
         
-        doc_endpoints = [
-            "/api/docs",
-            "/docs", 
-            "/swagger",
-            "/api/swagger",
-            "/openapi.json",
-            "/api-docs",
-            "/redoc"
-        ]
-        
-        for endpoint in doc_endpoints:
+        for endpoint, (response, error) in zip(DOC_ENDPOINTS, self.fetch_all(DOC_ENDPOINTS)):
             try:
-                url = urljoin(self.base_url, endpoint)
                 print(f"🔍 Testing: {endpoint}")
-                
-                response = self.session.get(url, timeout=5)
+                if error:
+                    raise error
                 
                 if response.status_code == 200:
                     print(f"   ✅ Accessible! Content type: {response.headers.get('content-type', 'unknown')}")
@@ -178,22 +224,11 @@ class ElevatedAccessExplorer:
         """Test service-specific endpoint patterns"""
         print("\n🎯 Testing service-specific patterns...")
         
-        # Test if services have their own auth endpoints
-        service_auth_patterns = [
-            "/workforce-service/auth/login",
-            "/fleet-service/auth/login", 
-            "/analytics-service/auth/login",
-            "/workforce-api/auth/login",
-            "/fleet-api/auth/login",
-            "/analytics-api/auth/login"
-        ]
-        
-        for endpoint in service_auth_patterns:
+        for endpoint, (response, error) in zip(SERVICE_AUTH_PATTERNS, self.fetch_all(SERVICE_AUTH_PATTERNS)):
             try:
-                url = urljoin(self.base_url, endpoint)
                 print(f"🔍 Testing auth: {endpoint}")
-                
-                response = self.session.get(url, timeout=5)
+                if error:
+                    raise error
                 
                 if response.status_code == 200:
                     print(f"   ✅ Auth endpoint exists!")
@@ -214,6 +249,9 @@ class ElevatedAccessExplorer:
         if not self.authenticate():
             return
         
+        # Probe the endpoints of all sections in one concurrent batch, the sections below only report the results
+        self.fetch_all(USER_ENDPOINTS + PORTAL_ENDPOINTS + DOC_ENDPOINTS + SERVICE_AUTH_PATTERNS)
+        
         # Analyze current permissions
         self.analyze_token_permissions()
         
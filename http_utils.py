@@ -0,0 +1,119 @@
+"""
+Helpers shared by the API scripts for HTTP sessions, streamed responses and JSON (de)serialization
+"""
+import atexit
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+
+try:
+    # Optional C-accelerated JSON, noticeably faster for large bodies such as openapi.json
+    import orjson
+except ImportError:
+    orjson = None
+
+# Number of probes in flight at once; the connection pool is sized to match so every worker keeps its
+# connection alive instead of re-doing the TCP/TLS handshake
+MAX_CONCURRENT_PROBES = 32
+
+# Number of bytes read from non-JSON bodies for the response preview
+PREVIEW_CHUNK_SIZE = 2048
+
+# Headers for request bodies that are serialized up front with json_dumps_compact
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse a JSON document, using orjson when available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_dumps_compact(obj: Any) -> str:
+    """Serialize to single-line JSON text, using orjson when available"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str).decode()
+    return json.dumps(obj, default=str)
+
+
+def json_dumps_indented(obj: Any) -> str:
+    """Serialize to indented JSON text, using orjson when available"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
+def release_response(response: requests.Response) -> None:
+    """
+    Release a streamed response whose body is not needed. Small bodies are drained so the connection
+    goes back to the pool, larger ones are dropped together with the connection instead of downloaded.
+    """
+    content_length = response.headers.get('Content-Length', '')
+    if content_length.isdigit() and int(content_length) <= PREVIEW_CHUNK_SIZE:
+        response.content
+    response.close()
+
+
+def read_head(response: requests.Response, size: int = PREVIEW_CHUNK_SIZE) -> bytes:
+    """
+    Read at most size bytes of a streamed response body and release the response, so a preview of a large
+    body costs no more than the preview itself.
+    """
+    content_length = response.headers.get('Content-Length', '')
+    if content_length.isdigit() and int(content_length) <= size:
+        # Small enough to read in full, which also returns the connection to the pool
+        head = response.content
+    else:
+        head = next(response.iter_content(size), b'')
+    response.close()
+    return head[:size]
+
+
+def create_session() -> requests.Session:
+    """Create a session with retries and a connection pool sized for MAX_CONCURRENT_PROBES concurrent probes"""
+    session = requests.Session()
+    
+    # Configure session with retries
+    adapter = requests.adapters.HTTPAdapter(
+        pool_maxsize=MAX_CONCURRENT_PROBES,
+        max_retries=requests.adapters.Retry(
+            total=2,
+            backoff_factor=0.3,
+            # Only gateway errors are transient; a 500 is a probe result of its own. Once the retries are
+            # used up, the last response is returned so its status code is still recorded.
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False
+        )
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide discovery session, so all discovery passes share one keep-alive connection pool"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+            atexit.register(_shared_session.close)
+    return _shared_session
+
+
+_shared_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the process-wide probe thread pool, so its worker threads are started once and reused by every batch"""
+    global _shared_executor
+    with _shared_session_lock:
+        if _shared_executor is None:
+            _shared_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PROBES, thread_name_prefix="probe")
+            atexit.register(_shared_executor.shutdown)
+    return _shared_executor
@@ -2,16 +2,52 @@
 """
 Inspect the actual Data Navigator web portal page to find API calls
 """
-import requests
-import json
 import os
 import re
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
+
+from http_utils import (
+    create_session,
+    get_executor,
+    json_dumps_indented,
+    read_head,
+    release_response,
+)
+from endpoint_utils import PAGE_HEADERS, compile_api_patterns, find_api_endpoints
+
+# Look for various API call patterns, each with exactly one capturing group for the endpoint
+API_PATTERNS = (
+    # Direct API URLs
+    r'["\']([^"\']*(?:api|service)[^"\']*)["\']',
+    # Fetch/axios calls
+    r'(?:fetch|axios\.(?:get|post|put|delete))\s*\(\s*["\']([^"\']+)["\']',
+    # URL constants/variables
+    r'(?:url|endpoint|path)\s*[:=]\s*["\']([^"\']+)["\']',
+    # API base URLs
+    r'["\']([^"\']*\/(?:api|service)\/[^"\']*)["\']',
+    # Service endpoints
+    r'["\']([^"\']*(?:workforce|fleet|analytics|reporting|file)-(?:api|service)[^"\']*)["\']',
+)
+
+# Compiled once, the page and every script are scanned with each pattern
+COMPILED_API_PATTERNS = compile_api_patterns(API_PATTERNS)
+
+# Sources of the JavaScript files included by a page
+SCRIPT_SRC_PATTERN = re.compile(r'<script[^>]*src=["\']([^"\']+\.js[^"\']*)["\']')
+
+# Start of the source map reference at the end of a bundle; an inline map after it can be larger than the code
+SOURCE_MAP_MARKER = "//# sourceMappingURL="
+
+# Number of bytes read from working endpoints for the data preview
+PREVIEW_SIZE = 4096
+
+# Only the first part of a script is scanned, so a huge bundle is neither downloaded nor held in memory in full
+MAX_PAGE_SIZE = 1024 * 1024
 
 def authenticate_and_get_portal():
-    """Get the main portal page after authentication"""
+    """Get the main portal page after authentication, returning (content, session, page_url)"""
     base_url = "https://raas-ge-ver.prod.anybotics.com"
-    session = requests.Session()
+    session = create_session()
     
     # Authenticate
     email = os.getenv('ANYMAL_EMAIL')
@@ -30,7 +66,7 @@ def authenticate_and_get_portal():
         print(f"✅ Authentication successful")
     else:
         print(f"❌ Authentication failed: {response.status_code}")
-        return None, None
+        return None, None, None
     
     # Get the main portal page
     portal_urls = [
@@ -42,76 +78,89 @@ def authenticate_and_get_portal():
     for portal_url in portal_urls:
         try:
             print(f"📄 Fetching: {portal_url}")
-            url = urljoin(base_url, portal_url)
-            response = session.get(url, timeout=10)
+            url = base_url + portal_url
+            response = session.get(url, headers=PAGE_HEADERS, timeout=10)
             
             if response.status_code == 200:
-                print(f"✅ Got portal page: {len(response.text)} characters")
-                return response.text, session
+                content_encoding = response.headers.get('Content-Encoding', 'identity')
+                print(f"✅ Got portal page: {len(response.text)} characters ({content_encoding})")
+                # The final URL after redirects, which relative script sources are resolved against
+                return response.text, session, response.url
             else:
                 print(f"⚠️  Status {response.status_code} for {portal_url}")
                 
         except Exception as e:
             print(f"❌ Error fetching {portal_url}: {e}")
     
-    return None, None
+    return None, None, None
 
 def extract_api_calls_from_html(html_content):
     """Extract API calls from HTML/JavaScript content"""
     print("\n🔍 Analyzing portal page content...")
     
-    # Look for various API call patterns
-    patterns = [
-        # Direct API URLs
-        r'["\']([^"\']*(?:api|service)[^"\']*)["\']',
-        # Fetch/axios calls
-        r'(?:fetch|axios\.(?:get|post|put|delete))\s*\(\s*["\']([^"\']+)["\']',
-        # URL constants/variables
-        r'(?:url|endpoint|path)\s*[:=]\s*["\']([^"\']+)["\']',
-        # API base URLs
-        r'["\']([^"\']*\/(?:api|service)\/[^"\']*)["\']',
-        # Service endpoints
-        r'["\']([^"\']*(?:workforce|fleet|analytics|reporting|file)-(?:api|service)[^"\']*)["\']',
-    ]
-    
-    found_endpoints = set()
+    # Insertion-ordered set, endpoints are only sorted for the saved report
+    found_endpoints = {}
     
-    for pattern in patterns:
-        matches = re.findall(pattern, html_content, re.IGNORECASE)
-        for match in matches:
-            if is_valid_endpoint(match):
-                found_endpoints.add(match)
-                print(f"   🎯 Found: {match}")
+    for endpoint in find_api_endpoints(html_content, COMPILED_API_PATTERNS):
+        found_endpoints[endpoint] = None
+        print(f"   🎯 Found: {endpoint}")
     
     # Also look for JavaScript files to analyze
-    js_files = re.findall(r'<script[^>]*src=["\']([^"\']+\.js[^"\']*)["\']', html_content)
+    js_files = SCRIPT_SRC_PATTERN.findall(html_content)
     print(f"\n📜 Found {len(js_files)} JavaScript files:")
     for js_file in js_files[:10]:  # Limit to first 10
         print(f"   📄 {js_file}")
     
     return found_endpoints, js_files
 
-def is_valid_endpoint(path):
-    """Check if a path looks like a valid API endpoint"""
-    if not path or len(path) < 5:
-        return False
-    
-    # Must contain api or service
-    if 'api' not in path.lower() and 'service' not in path.lower():
-        return False
-    
-    # Skip common non-API patterns
-    skip_patterns = [
-        'javascript:', 'mailto:', 'tel:', 'http://', 'https://',
-        '.css', '.js', '.png', '.jpg', '.gif', '.svg', '.ico',
-        'google', 'facebook', 'twitter', 'linkedin', 'cdn'
-    ]
+def fetch_javascript(session, url):
+    """Fetch a JavaScript file, stopping at its source map reference or after MAX_PAGE_SIZE characters"""
+    with session.get(url, stream=True, timeout=10) as response:
+        if response.status_code != 200:
+            print(f"   ⚠️  Status {response.status_code} for {url}")
+            return ""
+        
+        response.encoding = response.encoding or 'utf-8'
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024, decode_unicode=True):
+            chunks.append(chunk)
+            size += len(chunk)
+            if SOURCE_MAP_MARKER in chunk or size >= MAX_PAGE_SIZE:
+                break
+        return "".join(chunks)[:MAX_PAGE_SIZE].partition(SOURCE_MAP_MARKER)[0]
+
+def extract_api_calls_from_javascript(js_files, session, page_url):
+    """
+    Extract API calls from the portal's own JavaScript files, where most endpoints of a bundled app are defined.
+    The script sources are resolved against page_url, the URL of the page they were found in.
+    """
+    print("\n🔍 Analyzing JavaScript files...")
     
-    for skip in skip_patterns:
-        if skip in path.lower():
-            return False
+    host = urlparse(page_url).netloc
+    urls = [url for url in dict.fromkeys(urljoin(page_url, js_file) for js_file in js_files)
+            if urlparse(url).netloc == host]
     
-    return True
+    def fetch(url):
+        try:
+            return fetch_javascript(session, url), None
+        except Exception as e:
+            return None, e
+    
+    found_endpoints = {}
+    
+    # Fetch the files concurrently, each one is scanned with every pattern
+    for url, (content, error) in zip(urls, get_executor().map(fetch, urls)):
+        if error:
+            print(f"   ❌ Error fetching {url}: {error}")
+            continue
+        
+        for endpoint in find_api_endpoints(content, COMPILED_API_PATTERNS):
+            if endpoint not in found_endpoints:
+                found_endpoints[endpoint] = None
+                print(f"   🎯 Found in {url.rsplit('/', 1)[-1]}: {endpoint}")
+    
+    return found_endpoints
 
 def test_discovered_endpoints(endpoints, session):
     """Test the discovered endpoints"""
@@ -120,28 +169,40 @@ def test_discovered_endpoints(endpoints, session):
     base_url = "https://raas-ge-ver.prod.anybotics.com"
     working_endpoints = []
     
-    for endpoint in sorted(endpoints):
+    # Clean up endpoints
+    endpoints = [endpoint if endpoint.startswith('/') else '/' + endpoint for endpoint in endpoints]
+    
+    def fetch(endpoint):
+        try:
+            # Endpoints were cleaned up to start with '/', so plain concatenation is enough
+            response = session.get(base_url + endpoint, stream=True, timeout=5)
+            # Only the status code of unsuccessful responses is reported, so skip downloading their bodies;
+            # of successful ones only the start is shown, so read no more than that
+            if response.status_code != 200:
+                release_response(response)
+                return response, None, None
+            return response, read_head(response, PREVIEW_SIZE), None
+        except Exception as e:
+            return None, None, e
+    
+    # Issue the requests concurrently; results come back in the original order for reporting
+    for endpoint, (response, head, error) in zip(endpoints, get_executor().map(fetch, endpoints)):
         try:
-            # Clean up endpoint
-            if not endpoint.startswith('/'):
-                endpoint = '/' + endpoint
-            
-            url = urljoin(base_url, endpoint)
             print(f"🔍 Testing: {endpoint}")
-            
-            response = session.get(url, timeout=5)
+            if error:
+                raise error
             
             if response.status_code == 200:
-                try:
-                    data = response.json()
-                    data_preview = str(data)[:100] + "..." if len(str(data)) > 100 else str(data)
+                if 'json' in response.headers.get('Content-Type', ''):
+                    text = head.decode('utf-8', 'replace')
+                    data_preview = text[:100] + "..." if len(text) > 100 else text
                     print(f"   ✅ Working: {response.status_code} - {data_preview}")
                     working_endpoints.append({
                         'endpoint': endpoint,
                         'status': response.status_code,
                         'data_sample': data_preview
                     })
-                except:
+                else:
                     print(f"   ✅ Working: {response.status_code} (non-JSON)")
                     working_endpoints.append({
                         'endpoint': endpoint,
@@ -163,7 +224,7 @@ def main():
     print("🚀 Inspecting Data Navigator Portal Page...")
     
     # Get portal page content
-    html_content, session = authenticate_and_get_portal()
+    html_content, session, page_url = authenticate_and_get_portal()
     
     if not html_content:
         print("❌ Could not get portal page content")
@@ -172,6 +233,9 @@ def main():
     # Extract API endpoints from HTML
     endpoints, js_files = extract_api_calls_from_html(html_content)
     
+    # Add the API endpoints defined in the JavaScript files
+    endpoints.update(extract_api_calls_from_javascript(js_files, session, page_url))
+    
     if not endpoints:
         print("⚠️  No API endpoints found in portal page")
         return
@@ -182,15 +246,15 @@ def main():
     # Save results
     results = {
         'timestamp': '2025-01-16',
-        'discovered_endpoints': sorted(list(endpoints)),
+        'discovered_endpoints': sorted(endpoints),
         'javascript_files': js_files,
-        'working_endpoints': working_endpoints,
+        'working_endpoints': sorted(working_endpoints, key=lambda info: info['endpoint']),
         'total_discovered': len(endpoints),
         'total_working': len(working_endpoints)
     }
     
     with open('portal_inspection_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+        f.write(json_dumps_indented(results))
     
     print(f"\n📊 RESULTS:")
     print(f"🔍 Discovered endpoints: {len(endpoints)}")
@@ -5,22 +5,63 @@ Demonstrates how to authenticate and download inspection data files
 """
 
 import requests
+import urllib3
+import atexit
+import functools
+import hashlib
 import json
 import os
+import shutil
+import tarfile
+import threading
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 
+from http_utils import json_loads
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Number of files downloaded at once by the batch methods
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# Errors of a streamed download; reading response.raw directly raises urllib3's own exceptions,
+# which requests only wraps into RequestException when the body is read through iter_content
+STREAM_ERRORS = (requests.exceptions.RequestException, urllib3.exceptions.HTTPError)
+
+# Smallest byte range worth a request of its own when a file is downloaded in parallel parts
+MIN_RANGE_PART_SIZE = 8 << 20
+
+# Directory below the output directory holding the validators of downloaded files, for conditional requests
+CACHE_DIR = os.path.join('.cache', 'anymal')
+
+# Common names of an asset's files, tried by batch_download_with_pattern when the server does not list them
+FILENAME_PATTERNS = (
+    "{asset_id}{ext}",
+    "{asset_id}_thermal{ext}",
+    "{asset_id}_visual{ext}",
+    "{asset_id}_audio{ext}",
+    "inspection_{asset_id}{ext}",
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_filename(filename: str) -> str:
+    """URL encode a filename as a single path segment, cached as batches and retries encode the same names again"""
+    return quote(filename, safe='')
+
+
 class ANYmalDataDownloader:
     """Client for downloading inspection data from ANYmal API"""
     
-    def __init__(self, server_url: str, verify_ssl: bool = True, timeout: int = 30):
+    def __init__(self, server_url: str, verify_ssl: bool = True, timeout: int = 30, stream_chunk_size: int = 1 << 20,
+                 prewarm: bool = True):
         """
         Initialize the downloader
         
@@ -28,30 +69,58 @@ class ANYmalDataDownloader:
             server_url: ANYmal server URL (e.g., 'your-server.com')
             verify_ssl: Whether to verify SSL certificates
             timeout: Request timeout in seconds
+            stream_chunk_size: Size in bytes of the chunks downloaded files are streamed to disk in
+            prewarm: Whether to open a connection to the server in the background, ready for authenticate()
         """
         # Clean up server URL
         server_url = server_url.strip().strip('/')
         if not server_url.startswith('http'):
             server_url = f"https://{server_url}"
         self.base_url = server_url.replace('api-', '')
+        self._raw_data_url = f"{self.base_url}/data-navigator-api/inspections/raw-data/"
         
         self.verify_ssl = verify_ssl
         self.timeout = timeout
+        self.stream_chunk_size = stream_chunk_size
         self.access_token: Optional[str] = None
+        # Deadline on the time.monotonic() clock, so wall clock adjustments cannot extend or cut short the token
         self.token_expires_at: Optional[float] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Whether the server offers the raw data bundle endpoint, None until it was tried
+        self._bundle_supported: Optional[bool] = None
         
         # Configure session with retries
         self.session = requests.Session()
         adapter = requests.adapters.HTTPAdapter(
+            # Enough pooled connections for every download worker plus the parts of ranged downloads, so
+            # concurrent requests keep their connections alive instead of re-doing the TLS handshake
+            pool_maxsize=MAX_CONCURRENT_DOWNLOADS * 4,
+            pool_block=False,
             max_retries=requests.adapters.Retry(
                 total=3,
                 backoff_factor=0.3,
-                status_forcelist=[500, 502, 503, 504]
+                status_forcelist=[500, 502, 503, 504],
+                # Only retry requests that are safe to repeat; a failed login is reported instead
+                allowed_methods=frozenset(['GET', 'HEAD'])
             )
         )
         self.session.mount('http://', adapter)
         self.session.mount('https://', adapter)
         
+        if prewarm:
+            threading.Thread(target=self._prewarm, name="prewarm", daemon=True).start()
+        
+    def _prewarm(self):
+        """Resolve the server and do the TLS handshake while the caller is still getting ready, pooling the connection"""
+        # Sent through the adapter directly, as authenticate() may be updating the session headers meanwhile
+        request = requests.Request('HEAD', self.base_url).prepare()
+        try:
+            response = self.session.get_adapter(self.base_url).send(request, timeout=2, verify=self.verify_ssl)
+            # Consuming the empty body hands the connection back to the pool instead of closing it
+            response.content
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Connection prewarm failed: {e}")
+        
     def authenticate(self, email: str, password: str) -> bool:
         """
         Authenticate with the ANYmal server
@@ -84,12 +153,12 @@ class ANYmalDataDownloader:
             )
             
             if response.status_code == 201:
-                data = response.json()
+                data = json_loads(response.content)
                 self.access_token = data.get("accessToken")
                 
                 # Calculate token expiration (assume 1 hour if not provided)
                 expires_in = data.get("expiresIn", 3600)
-                self.token_expires_at = time.time() + expires_in - 300  # 5 min buffer
+                self.token_expires_at = time.monotonic() + expires_in - 300  # 5 min buffer
                 
                 # Set default authorization header for future requests
                 self.session.headers.update({
@@ -99,7 +168,7 @@ class ANYmalDataDownloader:
                 logger.info("Authentication successful")
                 return True
             else:
-                logger.error(f"Authentication failed: {response.status_code} - {response.text}")
+                logger.error(f"Authentication failed: {response.status_code} - {response.content[:512]!r}")
                 return False
                 
         except requests.exceptions.RequestException as e:
@@ -110,7 +179,7 @@ class ANYmalDataDownloader:
         """Check if the access token is expired"""
         if not self.token_expires_at:
             return False
-        return time.time() >= self.token_expires_at
+        return time.monotonic() >= self.token_expires_at
     
     def download_inspection_file(self, filename: str, output_dir: str = "./downloads") -> Optional[str]:
         """
@@ -123,6 +192,23 @@ class ANYmalDataDownloader:
         Returns:
             Path to downloaded file if successful, None otherwise
         """
+        file_info = self.probe_and_download(filename, output_dir)
+        return file_info.get('path') if file_info else None
+    
+    def probe_and_download(self, filename: str, output_dir: str = "./downloads") -> Optional[Dict[str, Any]]:
+        """
+        Download a file and get its information with a single request
+        
+        Replaces a get_file_info() check followed by a download, which costs a round trip more per file.
+        
+        Args:
+            filename: Name of the file to download
+            output_dir: Directory to save the downloaded file
+            
+        Returns:
+            Dictionary with file info and the downloaded 'path' if the file exists,
+            {'filename': ..., 'exists': False} if it does not, None if the request failed
+        """
         if not self.access_token:
             logger.error("Not authenticated. Call authenticate() first.")
             return None
@@ -135,47 +221,236 @@ class ANYmalDataDownloader:
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
         # URL encode filename to handle special characters
-        encoded_filename = quote(filename, safe='')
-        download_url = f"{self.base_url}/data-navigator-api/inspections/raw-data/{encoded_filename}"
+        download_url = self._raw_data_url + _quote_filename(filename)
         output_path = os.path.join(output_dir, filename)
+        meta_path = self._cache_meta_path(output_dir, filename)
         
         try:
             logger.info(f"Downloading {filename}...")
             
+            # Revalidate an earlier download of the file, so an unchanged file is not sent again
             response = self.session.get(
                 download_url, 
+                headers=self._cached_validators(meta_path, output_path),
                 verify=self.verify_ssl, 
                 stream=True,
                 timeout=self.timeout
             )
             
-            if response.status_code == 200:
-                # Download file in chunks to handle large files
-                with open(output_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+            if response.status_code == 304:
+                response.close()
+                logger.info(f"{filename} is unchanged, keeping {output_path}")
+                return self._downloaded_file_info(filename, output_path, response)
+            
+            elif response.status_code == 200:
+                # Copy the raw stream to disk in large chunks; the copy loop runs in C and
+                # urllib3 still undoes any gzip/deflate transfer encoding. An in-kernel socket-to-file
+                # copy (os.splice/sendfile) is not possible here, as the bytes on the socket are TLS records.
+                response.raw.decode_content = True
+                try:
+                    with open(output_path, 'wb', buffering=self.stream_chunk_size) as f:
+                        shutil.copyfileobj(response.raw, f, length=self.stream_chunk_size)
+                except STREAM_ERRORS:
+                    # Do not leave a truncated file behind, it would look like a complete download
+                    os.remove(output_path)
+                    raise
                 
                 file_size = os.path.getsize(output_path)
+                self._store_validators(meta_path, output_path, response)
                 logger.info(f"Successfully downloaded {filename} ({file_size} bytes) to {output_path}")
-                return output_path
+                return self._downloaded_file_info(filename, output_path, response)
                 
             elif response.status_code == 404:
                 logger.warning(f"File {filename} not found (may not be uploaded yet)")
-                return None
+                return {'filename': filename, 'exists': False}
                 
             elif response.status_code == 401:
                 logger.error("Authentication token expired or invalid")
                 return None
                 
             else:
-                logger.error(f"Download failed: {response.status_code} - {response.text}")
+                # Only the start of the error body is logged, the rest is not downloaded. A body that
+                # cannot be read must not hide the HTTP error itself.
+                try:
+                    body_head = next(response.iter_content(512), b'')
+                except STREAM_ERRORS:
+                    body_head = b''
+                logger.error(f"Download failed: {response.status_code} - {body_head!r}")
+                response.close()
                 return None
                 
-        except requests.exceptions.RequestException as e:
+        except STREAM_ERRORS as e:
             logger.error(f"Download request failed: {e}")
             return None
     
+    @staticmethod
+    def _downloaded_file_info(filename: str, output_path: str, response: requests.Response) -> Dict[str, Any]:
+        """Get the information of a downloaded file, as get_file_info() reports it, plus its path"""
+        return {
+            'filename': filename,
+            'size': os.path.getsize(output_path),
+            'content_type': response.headers.get('Content-Type'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'exists': True,
+            'path': output_path
+        }
+    
+    @staticmethod
+    def _cache_meta_path(output_dir: str, filename: str) -> str:
+        """Get the path of the validators of a downloaded file, named by a short hash of its filename"""
+        key = hashlib.blake2b(filename.encode(), digest_size=16).hexdigest()
+        return os.path.join(output_dir, CACHE_DIR, f"{key}.json")
+    
+    @staticmethod
+    def _cached_validators(meta_path: str, output_path: str) -> Dict[str, str]:
+        """
+        Get the conditional request headers for an earlier download
+        
+        Returns:
+            If-None-Match/If-Modified-Since headers, or no headers if the file is not cached or was changed locally
+        """
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            stat = os.stat(output_path)
+        except (OSError, ValueError):
+            return {}
+        
+        if meta.get("size") != stat.st_size or meta.get("mtime") != stat.st_mtime_ns:
+            return {}
+        
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+    
+    @staticmethod
+    def _store_validators(meta_path: str, output_path: str, response: requests.Response):
+        """Remember the validators of a downloaded file, if the server sent any"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        
+        stat = os.stat(output_path)
+        meta = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns
+        }
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            # Written next to its final name and renamed, so a concurrent reader never sees half a file
+            tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, meta_path)
+        except OSError as e:
+            logger.debug(f"Could not cache validators of {output_path}: {e}")
+    
+    def download_inspection_file_ranged(self, filename: str, output_dir: str = "./downloads", parts: int = 4) -> Optional[str]:
+        """
+        Download a large inspection file as parallel byte ranges
+        
+        Each part is written at its own offset and resumed from where it stopped if its connection drops.
+        Falls back to download_inspection_file when the server does not accept ranges or the file is small.
+        
+        Args:
+            filename: Name of the file to download
+            output_dir: Directory to save the downloaded file
+            parts: Number of byte ranges downloaded at once
+            
+        Returns:
+            Path to downloaded file if successful, None otherwise
+        """
+        if not self.access_token or self._is_token_expired():
+            logger.error("Not authenticated or token expired")
+            return None
+        
+        download_url = self._raw_data_url + _quote_filename(filename)
+        output_path = os.path.join(output_dir, filename)
+        
+        try:
+            # Ranges address the stored bytes, so ask for the file without transfer compression
+            response = self.session.head(
+                download_url,
+                headers={"Accept-Encoding": "identity"},
+                verify=self.verify_ssl,
+                timeout=self.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f"File info request failed: {e}")
+            return None
+        
+        size = int(response.headers.get('Content-Length') or 0)
+        if (response.status_code != 200 or response.headers.get('Accept-Ranges') != 'bytes'
+                or size < 2 * MIN_RANGE_PART_SIZE or not hasattr(os, 'pwrite')):
+            return self.download_inspection_file(filename, output_dir)
+        
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        
+        part_size = max(-(-size // parts), MIN_RANGE_PART_SIZE)
+        ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+        
+        logger.info(f"Downloading {filename} ({size} bytes) in {len(ranges)} parts...")
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        completed = False
+        try:
+            os.ftruncate(fd, size)
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                results = executor.map(lambda byte_range: self._download_range(download_url, fd, *byte_range), ranges)
+                completed = all(results)
+        finally:
+            os.close(fd)
+            # The file was preallocated to its full size, so an incomplete one would look complete
+            if not completed:
+                os.remove(output_path)
+        
+        if not completed:
+            logger.error(f"Download of {filename} failed")
+            return None
+        
+        logger.info(f"Successfully downloaded {filename} ({size} bytes) to {output_path}")
+        return output_path
+    
+    def _download_range(self, download_url: str, fd: int, start: int, end: int, attempts: int = 3) -> bool:
+        """
+        Download the bytes start..end (inclusive) into fd at the same offset
+        
+        Returns:
+            True if the whole range was written, False otherwise
+        """
+        for attempt in range(attempts):
+            try:
+                response = self.session.get(
+                    download_url,
+                    headers={"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"},
+                    verify=self.verify_ssl,
+                    stream=True,
+                    timeout=self.timeout
+                )
+                with response:
+                    if response.status_code != 206:
+                        logger.error(f"Range request failed: {response.status_code}")
+                        return False
+                    for chunk in response.raw.stream(self.stream_chunk_size, decode_content=False):
+                        view = memoryview(chunk)
+                        while view:
+                            written = os.pwrite(fd, view, start)
+                            view = view[written:]
+                            start += written
+                if start > end:
+                    return True
+                # Retry only the bytes that are still missing
+                logger.warning(f"Range download ended early at byte {start} (attempt {attempt + 1}/{attempts})")
+            except STREAM_ERRORS as e:
+                logger.warning(f"Range download interrupted at byte {start} (attempt {attempt + 1}/{attempts}): {e}")
+        
+        return False
+    
     def download_multiple_files(self, filenames: list, output_dir: str = "./downloads") -> Dict[str, Optional[str]]:
         """
         Download multiple inspection files
@@ -187,13 +462,33 @@ class ANYmalDataDownloader:
         Returns:
             Dictionary mapping filename to downloaded path (or None if failed)
         """
-        results = {}
+        file_infos = self.probe_and_download_multiple(filenames, output_dir)
+        return {filename: file_info.get('path') if file_info else None for filename, file_info in file_infos.items()}
+    
+    def probe_and_download_multiple(self, filenames: list,
+                                    output_dir: str = "./downloads") -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Download multiple inspection files, getting each file's information as probe_and_download() does
         
-        for filename in filenames:
-            result = self.download_inspection_file(filename, output_dir)
-            results[filename] = result
+        Args:
+            filenames: List of filenames to download
+            output_dir: Directory to save downloaded files
             
-        return results
+        Returns:
+            Dictionary mapping filename to its probe_and_download() result
+        """
+        # Downloads are I/O bound, so overlap them on a thread pool sharing the session's connections.
+        # Duplicates are dropped so two workers never write the same file.
+        filenames = list(dict.fromkeys(filenames))
+        file_infos = self._get_executor().map(self.probe_and_download, filenames, [output_dir] * len(filenames))
+        
+        return dict(zip(filenames, file_infos))
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the download thread pool, created on first use and reused by all batches until close()"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS, thread_name_prefix="download")
+        return self._executor
     
     def batch_download_with_pattern(self, asset_id: str, file_extensions: list = None, output_dir: str = "./downloads") -> Dict[str, Optional[str]]:
         """
@@ -210,25 +505,153 @@ class ANYmalDataDownloader:
         if file_extensions is None:
             file_extensions = ['.jpg', '.png', '.mp4', '.wav', '.json']
             
-        results = {}
-        
-        for ext in file_extensions:
+        # Download the asset's actual files when the server lists them, instead of guessing names
+        listed_files = self.list_inspection_files(asset_id)
+        if listed_files is not None:
+            # The listing is already limited to the asset, so only the extension is checked
+            extensions = tuple(file_extensions)
+            candidates = [filename for filename in listed_files if filename.endswith(extensions)]
+        else:
             # Try common naming patterns
-            patterns = [
-                f"{asset_id}{ext}",
-                f"{asset_id}_thermal{ext}",
-                f"{asset_id}_visual{ext}",
-                f"{asset_id}_audio{ext}",
-                f"inspection_{asset_id}{ext}"
+            candidates = [
+                pattern.format(asset_id=asset_id, ext=ext) for ext in file_extensions for pattern in FILENAME_PATTERNS
             ]
+        
+        if listed_files is not None:
+            # Listed files exist, so fetch them as one archive instead of a request per file
+            results = self.download_bundle(candidates, output_dir)
+        else:
+            # Most guessed candidates do not exist, so probe them all concurrently instead of one round trip after another
+            results = self.download_multiple_files(candidates, output_dir)
+        
+        return {pattern: result for pattern, result in results.items() if result}
+    
+    def download_bundle(self, filenames: list, output_dir: str = "./downloads") -> Dict[str, Optional[str]]:
+        """
+        Download multiple inspection files as a single tar archive
+        
+        Many inspection files are small measurements, for which a request each costs more than the data.
+        Files missing from the archive, or all of them if the server has no bundle endpoint, are
+        downloaded one by one with download_multiple_files.
+        
+        Args:
+            filenames: List of filenames to download
+            output_dir: Directory to save downloaded files
             
-            for pattern in patterns:
-                result = self.download_inspection_file(pattern, output_dir)
-                if result:
-                    results[pattern] = result
-                    
+        Returns:
+            Dictionary mapping filename to downloaded path (or None if failed)
+        """
+        filenames = list(dict.fromkeys(filenames))
+        results: Dict[str, Optional[str]] = {filename: None for filename in filenames}
+        # The bundle lists files comma separated, so names containing a comma cannot be part of it
+        bundled = [filename for filename in filenames if ',' not in filename]
+        
+        if bundled and self._bundle_supported is not False and self.access_token and not self._is_token_expired():
+            results.update(self._download_bundle(bundled, output_dir))
+        
+        missing = [filename for filename, path in results.items() if path is None]
+        if missing:
+            results.update(self.download_multiple_files(missing, output_dir))
+        
         return results
     
+    def _download_bundle(self, filenames: list, output_dir: str) -> Dict[str, str]:
+        """
+        Stream the bundle of the given files and extract the requested ones to output_dir
+        
+        Returns:
+            Dictionary mapping each extracted filename to its path
+        """
+        try:
+            response = self.session.get(
+                self._raw_data_url + "bundle",
+                params={"files": ",".join(filenames)},
+                verify=self.verify_ssl,
+                stream=True,
+                timeout=self.timeout
+            )
+        except STREAM_ERRORS as e:
+            logger.warning(f"Bundle request failed: {e}")
+            return {}
+        
+        extracted = {}
+        with response:
+            if response.status_code != 200:
+                # Remember a missing endpoint, so later batches do not ask for it again
+                if response.status_code in (404, 405, 501):
+                    self._bundle_supported = False
+                logger.info(f"Bundle download not available ({response.status_code}), downloading files one by one")
+                return extracted
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            requested = set(filenames)
+            response.raw.decode_content = True
+            try:
+                with tarfile.open(fileobj=response.raw, mode='r|*') as archive:
+                    for member in archive:
+                        # Only write the requested files, under their own name, so the archive cannot place files elsewhere
+                        filename = os.path.basename(member.name)
+                        if not member.isfile() or filename not in requested or filename in extracted:
+                            continue
+                        output_path = os.path.join(output_dir, filename)
+                        try:
+                            with open(output_path, 'wb', buffering=self.stream_chunk_size) as f:
+                                shutil.copyfileobj(archive.extractfile(member), f, length=self.stream_chunk_size)
+                        except (tarfile.TarError, *STREAM_ERRORS):
+                            # Do not leave a truncated file behind, it is downloaded again on its own
+                            os.remove(output_path)
+                            raise
+                        extracted[filename] = output_path
+                # Only a response that was read as a whole archive shows that the server offers bundles
+                self._bundle_supported = True
+            except (tarfile.TarError, *STREAM_ERRORS) as e:
+                logger.warning(f"Bundle download interrupted after {len(extracted)} files: {e}")
+        
+        logger.info(f"Downloaded {len(extracted)}/{len(filenames)} files as a bundle")
+        return extracted
+    
+    def list_inspection_files(self, asset_id: str) -> Optional[list]:
+        """
+        List the raw data files of an asset's inspections with a single request
+        
+        Args:
+            asset_id: Asset ID to list the files of
+            
+        Returns:
+            List of filenames, or None if the inspections listing does not name the files
+        """
+        if not self.access_token or self._is_token_expired():
+            logger.error("Not authenticated or token expired")
+            return None
+        
+        try:
+            response = self.session.get(
+                f"{self.base_url}/data-navigator-api/inspections",
+                params={"assetId": asset_id, "pageSize": 500},
+                verify=self.verify_ssl,
+                timeout=self.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Inspection listing request failed: {e}")
+            return None
+        
+        if response.status_code != 200:
+            logger.warning(f"Inspection listing failed: {response.status_code}")
+            return None
+        
+        # Files are listed either by name or as objects with a filename
+        try:
+            filenames = [
+                file.get("filename") if isinstance(file, dict) else file
+                for item in json_loads(response.content).get("items", [])
+                for file in item.get("files", [])
+            ]
+        except (ValueError, AttributeError) as e:
+            # Not JSON, or not shaped as expected; the caller falls back to the filename patterns
+            logger.warning(f"Unexpected inspection listing: {e}")
+            return None
+        filenames = [filename for filename in filenames if filename]
+        return filenames or None
+    
     def get_file_info(self, filename: str) -> Optional[Dict[str, Any]]:
         """
         Get file information without downloading (HEAD request)
@@ -243,8 +666,7 @@ class ANYmalDataDownloader:
             logger.error("Not authenticated or token expired")
             return None
             
-        encoded_filename = quote(filename, safe='')
-        download_url = f"{self.base_url}/data-navigator-api/inspections/raw-data/{encoded_filename}"
+        download_url = self._raw_data_url + _quote_filename(filename)
         
         try:
             response = self.session.head(download_url, verify=self.verify_ssl, timeout=self.timeout)
@@ -269,6 +691,9 @@ class ANYmalDataDownloader:
     
     def close(self):
         """Clean up resources"""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
         if self.session:
             self.session.close()
 
@@ -342,23 +767,75 @@ def main():
 
 # Utility functions for different use cases
 
-def download_single_file_simple(server_url: str, email: str, password: str, filename: str) -> bool:
+# Number of shared downloaders kept open; the least recently used one is closed when another account is added
+MAX_SHARED_DOWNLOADERS = 4
+
+# Random per-process key, so a shared downloader's password is checked by keyed digest instead of kept in memory
+_CREDENTIALS_KEY = os.urandom(16)
+
+_downloader_lock = threading.Lock()
+# Shared downloaders by (server_url, email), least recently used first, each with the digest of its password
+_downloaders: "OrderedDict[Tuple[str, str], Tuple[ANYmalDataDownloader, bytes]]" = OrderedDict()
+
+
+def _close_downloaders():
+    with _downloader_lock:
+        for downloader, _ in _downloaders.values():
+            downloader.close()
+        _downloaders.clear()
+
+
+atexit.register(_close_downloaders)
+
+
+def get_downloader(server_url: str, email: str, password: str) -> Optional[ANYmalDataDownloader]:
+    """
+    Get a shared authenticated downloader for an account, so repeated helper calls reuse its
+    connections and token instead of logging in again for every file
+    
+    Returns:
+        Authenticated downloader, or None if authentication failed
+    """
+    key = (server_url, email)
+    digest = hashlib.blake2b(password.encode(), key=_CREDENTIALS_KEY).digest()
+    with _downloader_lock:
+        downloader, known_digest = _downloaders.pop(key, (None, None))
+        if downloader is None:
+            downloader = ANYmalDataDownloader(server_url)
+        # Log in on first use, again once the token expired, and when called with a different password
+        if digest != known_digest or not downloader.access_token or downloader._is_token_expired():
+            if not downloader.authenticate(email, password):
+                downloader.close()
+                return None
+        _downloaders[key] = (downloader, digest)
+        while len(_downloaders) > MAX_SHARED_DOWNLOADERS:
+            _, (evicted, _) = _downloaders.popitem(last=False)
+            evicted.close()
+    return downloader
+
+
+def download_single_file_simple(server_url: str, email: str, password: str, filename: str,
+                                downloader: Optional[ANYmalDataDownloader] = None) -> bool:
     """
     Simple function to download a single file
     
+    Args:
+        downloader: Authenticated downloader to use, defaults to the shared one for the account
+    
     Returns:
         True if successful, False otherwise
     """
-    downloader = ANYmalDataDownloader(server_url)
+    downloader = downloader or get_downloader(server_url, email, password)
     
-    if downloader.authenticate(email, password):
+    if downloader:
         result = downloader.download_inspection_file(filename)
         return result is not None
     
     return False
 
 
-def download_with_retry(server_url: str, email: str, password: str, filename: str, max_retries: int = 3) -> Optional[str]:
+def download_with_retry(server_url: str, email: str, password: str, filename: str, max_retries: int = 3,
+                        downloader: Optional[ANYmalDataDownloader] = None) -> Optional[str]:
     """
     Download file with retry logic
     
@@ -368,13 +845,15 @@ def download_with_retry(server_url: str, email: str, password: str, filename: st
         password: User password  
         filename: File to download
         max_retries: Maximum number of retry attempts
+        downloader: Authenticated downloader to use, defaults to the shared one for the account
         
     Returns:
         Path to downloaded file if successful, None otherwise
     """
-    downloader = ANYmalDataDownloader(server_url)
+    # All attempts go through the same downloader, so a retry reuses its session and token
+    downloader = downloader or get_downloader(server_url, email, password)
     
-    if not downloader.authenticate(email, password):
+    if not downloader:
         return None
     
     for attempt in range(max_retries):
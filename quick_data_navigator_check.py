@@ -8,6 +8,8 @@ import requests
 import json
 import os
 
+from http_utils import json_loads
+
 def quick_check():
     """Quick check of Data Navigator API"""
     
@@ -31,7 +33,7 @@ def quick_check():
         print("❌ Authentication failed")
         return
     
-    token = auth_response.json().get("accessToken")
+    token = json_loads(auth_response.content).get("accessToken")
     session.headers.update({"Authorization": f"Bearer {token}"})
     
     print("✅ Authentication successful")
@@ -49,7 +51,7 @@ def quick_check():
         try:
             response = session.get(f"{base_url}{endpoint}", timeout=10)
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 total = data.get('totalItems', 0)
                 print(f"✅ {name}: {total} items available")
                 
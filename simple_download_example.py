@@ -6,7 +6,7 @@ Minimal code for quick testing and integration
 
 import os
 import sys
-from inspection_data_download_samples import ANYmalDataDownloader
+from inspection_data_download_samples import ANYmalDataDownloader, get_downloader
 
 def simple_download(server_url: str, email: str, password: str, filename: str) -> bool:
     """
@@ -21,30 +21,25 @@ def simple_download(server_url: str, email: str, password: str, filename: str) -
     Returns:
         True if successful, False otherwise
     """
-    # Initialize downloader
-    downloader = ANYmalDataDownloader(server_url, verify_ssl=True)
+    # Get the shared downloader for the account, it logs in only on first use and when its token expired
+    downloader = get_downloader(server_url, email, password)
     
     try:
-        # Authenticate
-        if not downloader.authenticate(email, password):
+        if not downloader:
             print("❌ Authentication failed")
             return False
         
         print("✅ Authentication successful")
         
-        # Check if file exists
-        file_info = downloader.get_file_info(filename)
-        if not file_info or not file_info.get('exists'):
+        # Download the file, its response also tells whether it exists
+        file_info = downloader.probe_and_download(filename)
+        if file_info and not file_info.get('exists'):
             print(f"❌ File '{filename}' not found on server")
             return False
         
-        print(f"📁 File found: {filename} ({file_info.get('size', 'unknown')} bytes)")
-        
-        # Download file
-        downloaded_path = downloader.download_inspection_file(filename)
-        
-        if downloaded_path:
-            print(f"✅ Downloaded successfully: {downloaded_path}")
+        if file_info:
+            print(f"📁 File found: {filename} ({file_info.get('size', 'unknown')} bytes)")
+            print(f"✅ Downloaded successfully: {file_info['path']}")
             return True
         else:
             print("❌ Download failed")
@@ -53,9 +48,6 @@ def simple_download(server_url: str, email: str, password: str, filename: str) -
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
-        
-    finally:
-        downloader.close()
 
 
 def interactive_download():
@@ -95,24 +87,19 @@ def interactive_download():
             if not filename:
                 continue
             
-            # Check file exists
-            print(f"🔍 Checking if '{filename}' exists...")
-            file_info = downloader.get_file_info(filename)
+            # Download, the response also tells whether the file exists
+            print(f"⬇️  Downloading '{filename}'...")
+            file_info = downloader.probe_and_download(filename)
             
-            if not file_info or not file_info.get('exists'):
+            if file_info and not file_info.get('exists'):
                 print(f"❌ File '{filename}' not found")
                 continue
             
-            size = file_info.get('size', 'unknown')
-            content_type = file_info.get('content_type', 'unknown')
-            print(f"📁 File found: {size} bytes, type: {content_type}")
-            
-            # Download
-            print(f"⬇️  Downloading '{filename}'...")
-            downloaded_path = downloader.download_inspection_file(filename)
-            
-            if downloaded_path:
-                print(f"✅ Downloaded: {downloaded_path}")
+            if file_info:
+                size = file_info.get('size', 'unknown')
+                content_type = file_info.get('content_type') or 'unknown'
+                print(f"📁 File found: {size} bytes, type: {content_type}")
+                print(f"✅ Downloaded: {file_info['path']}")
             else:
                 print("❌ Download failed")
                 
@@ -139,32 +126,29 @@ def batch_download_from_list(server_url: str, email: str, password: str, filenam
     Returns:
         Dictionary with download results
     """
-    downloader = ANYmalDataDownloader(server_url, verify_ssl=True)
+    # Get the shared downloader for the account, it logs in only on first use and when its token expired
+    downloader = get_downloader(server_url, email, password)
     results = {'successful': [], 'failed': [], 'not_found': []}
     
     try:
-        # Authenticate
-        if not downloader.authenticate(email, password):
+        if not downloader:
             print("❌ Authentication failed")
             return results
         
         print(f"✅ Authentication successful")
-        print(f"📋 Processing {len(filenames)} files...")
         
-        for i, filename in enumerate(filenames, 1):
-            print(f"\n[{i}/{len(filenames)}] Processing: {filename}")
+        # Download the files concurrently on the downloader's shared pool, which also drops duplicate names;
+        # each response tells whether the file exists. Results come back in list order for the progress output.
+        file_infos = downloader.probe_and_download_multiple(filenames)
+        print(f"📋 Processing {len(file_infos)} files...")
+        
+        for i, (filename, file_info) in enumerate(file_infos.items(), 1):
+            print(f"\n[{i}/{len(file_infos)}] Processing: {filename}")
             
-            # Check if file exists
-            file_info = downloader.get_file_info(filename)
-            if not file_info or not file_info.get('exists'):
+            if file_info and not file_info.get('exists'):
                 print(f"❌ Not found: {filename}")
                 results['not_found'].append(filename)
-                continue
-            
-            # Download file
-            downloaded_path = downloader.download_inspection_file(filename)
-            
-            if downloaded_path:
+            elif file_info:
                 print(f"✅ Downloaded: {filename}")
                 results['successful'].append(filename)
             else:
@@ -182,9 +166,6 @@ def batch_download_from_list(server_url: str, email: str, password: str, filenam
     except Exception as e:
         print(f"❌ Error: {e}")
         return results
-        
-    finally:
-        downloader.close()
 
 
 def main():
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the endpoint extraction of the web portal discovery scripts
+"""
+import unittest
+
+import discover_web_portal_apis
+import inspect_portal_page
+from endpoint_utils import find_api_endpoints
+
+# Portal page mixing relative paths, absolute URLs and API calls
+PAGE = """
+<script>
+  const API_BASE = "https://raas.example.com/data-navigator-api/inspections";
+  fetch('/data-navigator-api/missions?pageSize=10');
+  axios.get("/workforce-api/robots");
+  const config = {endpoint: "/authentication-service/auth/login", url: "https://cdn.example.com/lib.js"};
+</script>
+"""
+
+
+class WebPortalExtractionTest(unittest.TestCase):
+    def test_page_endpoints(self):
+        endpoints = set(find_api_endpoints(PAGE, discover_web_portal_apis.COMPILED_API_PATTERNS))
+        self.assertEqual(endpoints, {
+            "/data-navigator-api/inspections",
+            "/data-navigator-api/missions?pageSize=10",
+            "/workforce-api/robots",
+            "/authentication-service/auth/login",
+        })
+
+    def test_path_inside_absolute_url(self):
+        page = '"https://raas.example.com/data-navigator-api/inspections"'
+        endpoints = set(find_api_endpoints(page, discover_web_portal_apis.COMPILED_API_PATTERNS))
+        self.assertEqual(endpoints, {"/data-navigator-api/inspections"})
+
+
+class PortalPageExtractionTest(unittest.TestCase):
+    def test_page_endpoints(self):
+        endpoints = set(find_api_endpoints(PAGE, inspect_portal_page.COMPILED_API_PATTERNS))
+        self.assertEqual(endpoints, {
+            "/data-navigator-api/missions?pageSize=10",
+            "/workforce-api/robots",
+            "/authentication-service/auth/login",
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,7 @@ This simulates what happens when authentication succeeds
 
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Configure logging
@@ -46,23 +47,25 @@ class MockANYmalDataDownloader:
         
         logger.info(f"⬇️  Downloading {filename}...")
         
-        # Create a dummy file to simulate download
-        with open(output_path, 'w') as f:
-            f.write(f"Mock inspection data for {filename}\n")
-            f.write("This would be binary image/video data in real scenario\n")
-            f.write(f"Downloaded from: {self.base_url}\n")
+        # Create a dummy file to simulate download, written as one payload whose length is the file size
+        payload = (
+            f"Mock inspection data for {filename}\n"
+            "This would be binary image/video data in real scenario\n"
+            f"Downloaded from: {self.base_url}\n"
+        ).encode()
+        with open(output_path, 'wb') as f:
+            f.write(payload)
         
-        file_size = os.path.getsize(output_path)
+        file_size = len(payload)
         logger.info(f"✅ Successfully downloaded {filename} ({file_size} bytes) to {output_path}")
         return output_path
     
     def download_multiple_files(self, filenames: list, output_dir: str = "./downloads"):
-        """Mock multiple file download"""
-        results = {}
-        for filename in filenames:
-            result = self.download_inspection_file(filename, output_dir)
-            results[filename] = result
-        return results
+        """Mock multiple file download, concurrent like the real downloader"""
+        filenames = list(dict.fromkeys(filenames))
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            downloads = executor.map(self.download_inspection_file, filenames, [output_dir] * len(filenames))
+            return dict(zip(filenames, downloads))
     
     def batch_download_with_pattern(self, asset_id: str, file_extensions: list = None, output_dir: str = "./downloads"):
         """Mock batch download"""
@@ -8,11 +8,31 @@ import json
 import base64
 import numpy as np
 import cv2 as cv
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Tuple, Optional
 import logging
 
+try:
+    # Vectorized base64 decoder, several times faster on the large mono16 payloads
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+try:
+    # Optional C-accelerated JSON, kept local so the offline converter and its workers do not need requests
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # libjpeg-turbo encoder, faster than the libjpeg build of many OpenCV wheels
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -26,12 +46,19 @@ class ThermalJSONConverter:
         self.default_height = 256
         self.default_gain = 0.04
         self.default_offset = -273.15  # Kelvin to Celsius conversion
+        # Temperature array reused by the next file of the same size. Not thread safe: batches run one
+        # converter per worker process, so each instance only ever processes one file at a time
+        self._temperature_buffer: Optional[np.ndarray] = None
+        # Output directories already created, so batches do not create them again for every file
+        self._made_dirs = set()
         
     def load_thermal_json(self, json_file_path: str) -> Dict[str, Any]:
         """Load thermal measurement JSON file"""
         try:
-            with open(json_file_path, 'r') as f:
-                data = json.load(f)
+            # Parsed from bytes, using orjson when available
+            with open(json_file_path, 'rb') as f:
+                content = f.read()
+            data = orjson.loads(content) if orjson else json.loads(content)
             logger.info(f"Loaded thermal JSON: {json_file_path}")
             return data
         except Exception as e:
@@ -56,8 +83,8 @@ class ThermalJSONConverter:
             height = self.default_height
             
         try:
-            # Decode base64 data
-            binary_data = base64.b64decode(encoded_data)
+            # Decode base64 data, using pybase64 when available
+            binary_data = pybase64.b64decode(encoded_data) if pybase64 else base64.b64decode(encoded_data)
             logger.info(f"Decoded {len(binary_data)} bytes of thermal data")
             
             # Convert to uint16 array (mono16 format)
@@ -91,7 +118,9 @@ class ThermalJSONConverter:
             logger.error(f"Failed to decode mono16 data: {e}")
             raise
     
-    def convert_to_temperature(self, raw_image: np.ndarray, gain: float = None, offset: float = None) -> np.ndarray:
+    def convert_to_temperature(self, raw_image: np.ndarray, gain: float = None, offset: float = None,
+                               out: Optional[np.ndarray] = None,
+                               raw_range: Optional[Tuple[float, float]] = None) -> np.ndarray:
         """
         Convert raw uint16 values to temperature using ANYmal calibration formula
         
@@ -99,6 +128,8 @@ class ThermalJSONConverter:
             raw_image: Raw uint16 thermal image
             gain: Calibration gain (defaults to ANYmal standard)
             offset: Calibration offset (defaults to ANYmal standard)
+            out: float32 array of the image's shape to write the temperatures to, a new one if None
+            raw_range: Min and max raw value of the image if already known, scanned for if None
             
         Returns:
             Temperature image in Celsius
@@ -108,11 +139,15 @@ class ThermalJSONConverter:
         if offset is None:
             offset = self.default_offset
             
-        # Apply ANYmal temperature conversion formula: temp = gain * raw + offset
-        temperature_image = raw_image.astype(np.float32) * gain + offset
+        # Apply ANYmal temperature conversion formula: temp = gain * raw + offset,
+        # in place so only the output array is allocated
+        temperature_image = np.multiply(raw_image, gain, out=out, dtype=np.float32)
+        np.add(temperature_image, offset, out=temperature_image)
         
         logger.info(f"Temperature conversion: gain={gain}, offset={offset}")
-        logger.info(f"Temperature range: {temperature_image.min():.2f}°C - {temperature_image.max():.2f}°C")
+        # Logged from the raw value range, which is cheaper to get than scanning the float32 temperatures
+        min_temp, max_temp = self.temperature_range(raw_image, gain, offset, raw_range)
+        logger.info(f"Temperature range: {min_temp:.2f}°C - {max_temp:.2f}°C")
         
         return temperature_image
     
@@ -126,23 +161,76 @@ class ThermalJSONConverter:
         Returns:
             BGR color image for display/saving
         """
-        # Normalize temperature data to 0-255 range
-        normalized = cv.normalize(
-            temperature_image,
-            None,
-            alpha=0,
-            beta=255,
-            norm_type=cv.NORM_MINMAX,
-            dtype=cv.CV_8U
-        )
+        # Normalize temperature data to 0-255 range, scanning for the range once as it is also annotated
+        min_temp, max_temp, _, _ = cv.minMaxLoc(temperature_image)
+        scale = 255.0 / (max_temp - min_temp) if max_temp > min_temp else 0.0
+        normalized = cv.convertScaleAbs(temperature_image, alpha=scale, beta=-min_temp * scale)
+        
+        return self._colorize_thermal(normalized, min_temp, max_temp)
+    
+    def create_thermal_visualization_from_raw(self, raw_image: np.ndarray, gain: float = None,
+                                              offset: float = None,
+                                              raw_range: Optional[Tuple[float, float]] = None
+                                              ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Create colorized thermal visualization straight from the raw uint16 values
+        
+        Gives the same image as create_thermal_visualization(convert_to_temperature(raw_image)), as the
+        temperature is linear in the raw value, without building and scanning a float32 temperature image.
+        
+        Args:
+            raw_image: Raw uint16 thermal image
+            gain: Calibration gain (defaults to ANYmal standard)
+            offset: Calibration offset (defaults to ANYmal standard)
+            raw_range: Min and max raw value of the image if already known, scanned for if None
+            
+        Returns:
+            BGR color image for display/saving, and the normalized 0-255 grayscale image it was colored from
+        """
+        if gain is None:
+            gain = self.default_gain
+        if offset is None:
+            offset = self.default_offset
+        
+        if raw_range is None:
+            raw_min, raw_max, _, _ = cv.minMaxLoc(raw_image)
+        else:
+            raw_min, raw_max = raw_range
+        # Same scaling as a NORM_MINMAX normalize, without scanning the image for its range again
+        scale = 255.0 / (raw_max - raw_min) if raw_max > raw_min else 0.0
+        normalized = cv.convertScaleAbs(raw_image, alpha=scale, beta=-raw_min * scale)
+        if gain < 0:
+            # A negative gain makes the lowest raw value the hottest pixel
+            cv.bitwise_not(normalized, dst=normalized)
+        
+        min_temp, max_temp = self.temperature_range(raw_image, gain, offset, (raw_min, raw_max))
+        return self._colorize_thermal(normalized, min_temp, max_temp), normalized
+    
+    def temperature_range(self, raw_image: np.ndarray, gain: float = None, offset: float = None,
+                          raw_range: Optional[Tuple[float, float]] = None) -> Tuple[float, float]:
+        """
+        Get the min and max temperature of a raw uint16 thermal image from its raw value range,
+        scanning the image for that range unless raw_range already gives it
+        """
+        if gain is None:
+            gain = self.default_gain
+        if offset is None:
+            offset = self.default_offset
         
+        if raw_range is None:
+            raw_min, raw_max, _, _ = cv.minMaxLoc(raw_image)
+        else:
+            raw_min, raw_max = raw_range
+        min_temp, max_temp = sorted((gain * raw_min + offset, gain * raw_max + offset))
+        return min_temp, max_temp
+    
+    def _colorize_thermal(self, normalized: np.ndarray, min_temp: float, max_temp: float) -> np.ndarray:
+        """Apply the colormap to a normalized thermal image and annotate its temperature range"""
         # Apply JET colormap (standard for thermal imaging)
         colored_image = cv.applyColorMap(normalized, cv.COLORMAP_JET)
         
         # Add temperature annotations (ANYmal style)
-        min_temp = temperature_image.min()
-        max_temp = temperature_image.max()
-        height = temperature_image.shape[0]
+        height = normalized.shape[0]
         
         # Add min temperature text
         cv.putText(
@@ -171,6 +259,18 @@ class ThermalJSONConverter:
         logger.info("Created thermal visualization with temperature annotations")
         return colored_image
     
+    def save_jpeg(self, file_path: str, image: np.ndarray):
+        """Save a BGR image as JPEG, with simplejpeg when available and OpenCV's encoder otherwise"""
+        if simplejpeg is None:
+            cv.imwrite(file_path, image)
+            return
+        
+        # Same quality and chroma subsampling as OpenCV's defaults, so the output does not depend on the encoder
+        encoded = simplejpeg.encode_jpeg(np.ascontiguousarray(image), quality=95, colorspace='BGR',
+                                         colorsubsampling='420')
+        with open(file_path, 'wb') as f:
+            f.write(encoded)
+    
     def extract_metadata_from_filename(self, filename: str) -> Dict[str, str]:
         """Extract metadata from ANYmal thermal measurement filename"""
         # Parse filename: 0e3934eb-c4c7-4273-8c38-c5dcaf522f4a_UNIT_01_THERMAL_1T001_measurement.json
@@ -186,22 +286,28 @@ class ThermalJSONConverter:
         
         return metadata
     
-    def process_thermal_json(self, json_file_path: str, output_dir: str = "./thermal_output") -> Dict[str, str]:
+    def process_thermal_json(self, json_file_path: str, output_dir: str = "./thermal_output",
+                             save_csv: bool = False) -> Dict[str, str]:
         """
         Complete processing pipeline for thermal JSON files
         
         Args:
             json_file_path: Path to thermal measurement JSON file
             output_dir: Directory to save processed files
+            save_csv: Whether to also save the temperatures as CSV text, which is slow to write and
+                      holds the same values as the temperature .npy file
             
         Returns:
             Dictionary with paths to generated files
         """
         # Create output directory
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        if output_dir not in self._made_dirs:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            self._made_dirs.add(output_dir)
         
-        # Extract base filename for outputs
+        # Extract base filename for outputs, all output paths share it as prefix
         base_filename = Path(json_file_path).stem
+        output_prefix = os.path.join(output_dir, base_filename)
         
         logger.info(f"Processing thermal JSON: {json_file_path}")
         
@@ -226,38 +332,48 @@ class ThermalJSONConverter:
         # Decode mono16 data
         raw_image = self.decode_mono16_data(encoded_data, width, height)
         
-        # Convert to temperature
-        temperature_image = self.convert_to_temperature(raw_image, gain, offset)
+        # Scan the raw values for their range once, every step below derives its range from it
+        raw_min, raw_max, _, _ = cv.minMaxLoc(raw_image)
+        raw_range = (raw_min, raw_max)
+        
+        # Convert to temperature, into a buffer reused by the next file as the array is only saved here
+        if self._temperature_buffer is None or self._temperature_buffer.shape != raw_image.shape:
+            self._temperature_buffer = np.empty(raw_image.shape, dtype=np.float32)
+        temperature_image = self.convert_to_temperature(
+            raw_image, gain, offset, out=self._temperature_buffer, raw_range=raw_range
+        )
         
-        # Create visualization
-        thermal_display = self.create_thermal_visualization(temperature_image)
+        # Create visualization from the raw values, which are half the size of the float32 temperatures
+        thermal_display, normalized_temp = self.create_thermal_visualization_from_raw(
+            raw_image, gain, offset, raw_range
+        )
+        min_temp, max_temp = self.temperature_range(raw_image, gain, offset, raw_range)
         
         # Save files
         output_files = {}
         
         # 1. Save raw uint16 data
-        raw_file = os.path.join(output_dir, f"{base_filename}_raw_uint16.npy")
-        np.save(raw_file, raw_image)
+        raw_file = output_prefix + "_raw_uint16.npy"
+        np.save(raw_file, raw_image, allow_pickle=False)
         output_files['raw_data'] = raw_file
         
         # 2. Save temperature data
-        temp_file = os.path.join(output_dir, f"{base_filename}_temperatures.npy")
-        np.save(temp_file, temperature_image)
+        temp_file = output_prefix + "_temperatures.npy"
+        np.save(temp_file, temperature_image, allow_pickle=False)
         output_files['temperature_data'] = temp_file
         
         # 3. Save thermal visualization
-        display_file = os.path.join(output_dir, f"{base_filename}_thermal_display.jpg")
-        cv.imwrite(display_file, thermal_display)
+        display_file = output_prefix + "_thermal_display.jpg"
+        self.save_jpeg(display_file, thermal_display)
         output_files['display_image'] = display_file
         
         # 4. Save grayscale thermal image
-        grayscale_file = os.path.join(output_dir, f"{base_filename}_thermal_grayscale.png")
-        normalized_temp = cv.normalize(temperature_image, None, 0, 255, cv.NORM_MINMAX, dtype=cv.CV_8U)
+        grayscale_file = output_prefix + "_thermal_grayscale.png"
         cv.imwrite(grayscale_file, normalized_temp)
         output_files['grayscale_image'] = grayscale_file
         
         # 5. Save metadata
-        metadata_file = os.path.join(output_dir, f"{base_filename}_metadata.json")
+        metadata_file = output_prefix + "_metadata.json"
         full_metadata = {
             **metadata,
             'processing_info': {
@@ -265,23 +381,30 @@ class ThermalJSONConverter:
                 'height': int(height),
                 'gain': float(gain),
                 'offset': float(offset),
-                'min_temperature': float(temperature_image.min()),
-                'max_temperature': float(temperature_image.max()),
-                'raw_min': int(raw_image.min()),
-                'raw_max': int(raw_image.max()),
+                'min_temperature': float(min_temp),
+                'max_temperature': float(max_temp),
+                'raw_min': int(raw_min),
+                'raw_max': int(raw_max),
                 'conversion_formula': f'temperature = {gain} * raw_value + {offset}'
             },
-            'original_json': json_data
+            # Without the thermal data, which is already saved above and is most of the file
+            'original_json': {key: value for key, value in json_data.items() if key != 'data'}
         }
         
-        with open(metadata_file, 'w') as f:
-            json.dump(full_metadata, f, indent=2)
+        # Serialized with orjson when available
+        if orjson:
+            with open(metadata_file, 'wb') as f:
+                f.write(orjson.dumps(full_metadata, option=orjson.OPT_INDENT_2))
+        else:
+            with open(metadata_file, 'w') as f:
+                json.dump(full_metadata, f, indent=2)
         output_files['metadata'] = metadata_file
         
         # 6. Save CSV temperature data
-        csv_file = os.path.join(output_dir, f"{base_filename}_temperatures.csv")
-        np.savetxt(csv_file, temperature_image, delimiter=',', fmt='%.2f')
-        output_files['temperature_csv'] = csv_file
+        if save_csv:
+            csv_file = output_prefix + "_temperatures.csv"
+            np.savetxt(csv_file, temperature_image, delimiter=',', fmt='%.2f')
+            output_files['temperature_csv'] = csv_file
         
         logger.info(f"Processing complete! Generated {len(output_files)} files:")
         for file_type, file_path in output_files.items():
@@ -292,25 +415,74 @@ class ThermalJSONConverter:
     def analyze_thermal_data(self, temperature_image: np.ndarray, threshold_temp: float = 50.0) -> Dict[str, Any]:
         """Analyze thermal data for hotspots and statistics"""
         
+        # Mean and std come from one pass and min and max from another, instead of a pass per statistic
+        mean, std = cv.meanStdDev(temperature_image)
+        min_temp, max_temp, _, _ = cv.minMaxLoc(temperature_image)
+        # The hotspot mask is computed once and shared by the count and the locations
+        hotspot_mask = temperature_image > threshold_temp
+        hotspot_count = int(np.count_nonzero(hotspot_mask))
+        
         analysis = {
             'statistics': {
-                'mean_temp': float(np.mean(temperature_image)),
-                'std_temp': float(np.std(temperature_image)),
-                'min_temp': float(np.min(temperature_image)),
-                'max_temp': float(np.max(temperature_image)),
+                'mean_temp': float(mean[0, 0]),
+                'std_temp': float(std[0, 0]),
+                'min_temp': float(min_temp),
+                'max_temp': float(max_temp),
                 'median_temp': float(np.median(temperature_image))
             },
             'hotspots': {
                 'threshold': threshold_temp,
-                'count': int(np.sum(temperature_image > threshold_temp)),
-                'percentage': float(np.sum(temperature_image > threshold_temp) / temperature_image.size * 100),
-                'locations': np.where(temperature_image > threshold_temp)
+                'count': hotspot_count,
+                'percentage': float(hotspot_count / temperature_image.size * 100),
+                'locations': np.nonzero(hotspot_mask)
             }
         }
         
         return analysis
 
 
+# Converter of a batch_process_thermal_json worker process, created once per worker so its buffers are reused
+_worker_converter: Optional[ThermalJSONConverter] = None
+
+
+def _init_worker():
+    global _worker_converter
+    _worker_converter = ThermalJSONConverter()
+    # Files are already processed in parallel, so OpenCV's own threads would only compete with the other workers
+    cv.setNumThreads(1)
+
+
+def _process_in_worker(json_file_path: str, output_dir: str) -> Optional[Dict[str, str]]:
+    try:
+        return _worker_converter.process_thermal_json(json_file_path, output_dir)
+    except Exception as e:
+        logger.error(f"Processing {json_file_path} failed: {e}")
+        return None
+
+
+def batch_process_thermal_json(json_file_paths: list, output_dir: str = "./thermal_output",
+                               workers: Optional[int] = None) -> Dict[str, Optional[Dict[str, str]]]:
+    """
+    Process many thermal JSON files in parallel worker processes
+    
+    Args:
+        json_file_paths: Paths to thermal measurement JSON files
+        output_dir: Directory to save processed files
+        workers: Number of worker processes, defaults to the number of CPUs
+        
+    Returns:
+        Dictionary mapping each JSON file to the paths of its generated files (or None if it failed)
+    """
+    json_file_paths = list(json_file_paths)
+    # Forked workers can inherit OpenCV's thread pool in a locked state, so start them from a clean process
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method),
+                             initializer=_init_worker) as executor:
+        results = executor.map(_process_in_worker, json_file_paths, [output_dir] * len(json_file_paths), chunksize=4)
+        return dict(zip(json_file_paths, results))
+
+
 def main():
     """Example usage of the thermal JSON converter"""
     
@@ -329,7 +501,7 @@ def main():
         output_files = converter.process_thermal_json(json_file, "./thermal_converted")
         
         # Load temperature data for analysis
-        temp_data = np.load(output_files['temperature_data'])
+        temp_data = np.load(output_files['temperature_data'], mmap_mode='r')
         
         # Analyze thermal data
         analysis = converter.analyze_thermal_data(temp_data, threshold_temp=30.0)
@@ -5,14 +5,17 @@ Opens and displays the converted thermal/infrared images
 """
 
 import cv2
+import importlib.util
 import numpy as np
 import os
+import subprocess
+import sys
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 
 def view_thermal_images():
     """Display the thermal images with analysis"""
+    # Imported here as it is slow to import and only needed for this plot
+    import matplotlib.pyplot as plt
     
     # File paths
     thermal_dir = "thermal_converted"
@@ -27,10 +30,10 @@ def view_thermal_images():
         print("❌ Thermal image files not found. Please run the converter first.")
         return
     
-    # Load images and temperature data
+    # Load images and temperature data; the temperatures are memory-mapped so they are read as they are used
     display_image = cv2.imread(display_image_path)
     grayscale_image = cv2.imread(grayscale_image_path, cv2.IMREAD_GRAYSCALE)
-    temp_data = np.load(temp_data_path)
+    temp_data = np.load(temp_data_path, mmap_mode='r')
     
     # Convert BGR to RGB for matplotlib
     display_image_rgb = cv2.cvtColor(display_image, cv2.COLOR_BGR2RGB)
@@ -65,16 +68,16 @@ def view_thermal_images():
     axes[1, 0].clabel(contours, inline=True, fontsize=8, fmt='%.1f°C')
     
     # 4. Temperature histogram (bottom-right)
-    axes[1, 1].hist(temp_data.flatten(), bins=50, color='red', alpha=0.7, edgecolor='black')
+    axes[1, 1].hist(temp_data.ravel(), bins=50, color='red', alpha=0.7, edgecolor='black')
     axes[1, 1].set_title('Temperature Distribution', fontweight='bold')
     axes[1, 1].set_xlabel('Temperature (°C)')
     axes[1, 1].set_ylabel('Pixel Count')
     axes[1, 1].grid(True, alpha=0.3)
     
-    # Add statistics to histogram
-    mean_temp = np.mean(temp_data)
-    min_temp = np.min(temp_data)
-    max_temp = np.max(temp_data)
+    # Add statistics to histogram; mean and std come from one pass and min and max from another
+    mean, std = cv2.meanStdDev(temp_data)
+    mean_temp, std_temp = mean[0, 0], std[0, 0]
+    min_temp, max_temp, _, _ = cv2.minMaxLoc(temp_data)
     
     axes[1, 1].axvline(mean_temp, color='blue', linestyle='--', linewidth=2, label=f'Mean: {mean_temp:.2f}°C')
     axes[1, 1].axvline(min_temp, color='green', linestyle='--', linewidth=2, label=f'Min: {min_temp:.2f}°C')
@@ -86,7 +89,7 @@ def view_thermal_images():
     
     # Save the analysis plot
     analysis_path = f"{thermal_dir}/thermal_analysis_plot.png"
-    plt.savefig(analysis_path, dpi=300, bbox_inches='tight')
+    plt.savefig(analysis_path, dpi=150, bbox_inches='tight')
     print(f"📊 Thermal analysis plot saved: {analysis_path}")
     
     # Show the plot
@@ -99,21 +102,19 @@ def view_thermal_images():
     print(f"📏 Image Dimensions: {temp_data.shape[1]} × {temp_data.shape[0]} pixels")
     print(f"🌡️  Temperature Range: {min_temp:.2f}°C to {max_temp:.2f}°C")
     print(f"📊 Mean Temperature: {mean_temp:.2f}°C")
-    print(f"📈 Standard Deviation: {np.std(temp_data):.2f}°C")
+    print(f"📈 Standard Deviation: {std_temp:.2f}°C")
     
     # Hotspot analysis
     threshold_temp = 30.0
-    hotspots = temp_data > threshold_temp
-    hotspot_count = np.sum(hotspots)
+    hotspot_count = np.count_nonzero(temp_data > threshold_temp)
     hotspot_percentage = (hotspot_count / temp_data.size) * 100
     
     print(f"🔥 Hotspots (>{threshold_temp}°C): {hotspot_count} pixels ({hotspot_percentage:.2f}%)")
     
     if hotspot_count > 0:
-        hotspot_locations = np.where(hotspots)
-        max_hotspot_temp = np.max(temp_data[hotspots])
-        print(f"🌡️  Hottest Point: {max_hotspot_temp:.2f}°C")
-        print(f"📍 Hotspot Locations: {len(hotspot_locations[0])} areas detected")
+        # The hottest pixel is always a hotspot, and there is one location per hotspot pixel
+        print(f"🌡️  Hottest Point: {max_temp:.2f}°C")
+        print(f"📍 Hotspot Locations: {hotspot_count} areas detected")
     
     print(f"\n📁 Generated Files:")
     print(f"   🖼️  Colorized: {display_image_path}")
@@ -134,9 +135,6 @@ def open_images_with_system_viewer():
     
     try:
         # Try to open with system default viewer
-        import subprocess
-        import sys
-        
         if sys.platform.startswith('darwin'):  # macOS
             subprocess.run(['open', display_image_path])
             subprocess.run(['open', grayscale_image_path])
@@ -169,7 +167,7 @@ def create_thermal_summary():
         print("❌ Temperature data not found")
         return
     
-    temp_data = np.load(temp_data_path)
+    temp_data = np.load(temp_data_path, mmap_mode='r')
     
     print("\n" + "🔥" * 20 + " THERMAL IMAGE SUMMARY " + "🔥" * 20)
     print(f"📏 Dimensions: {temp_data.shape[1]} × {temp_data.shape[0]} pixels")
@@ -182,27 +180,23 @@ def create_thermal_summary():
     # Create ASCII thermal map (simplified)
     print(f"\n🗺️  ASCII Thermal Map (simplified 20×10):")
     
-    # Downsample for ASCII display
+    # Downsample for ASCII display, averaging all whole tiles at once through a reshaped view
     h, w = temp_data.shape
     step_h, step_w = h // 10, w // 20
-    
-    for i in range(0, h, step_h):
-        row = ""
-        for j in range(0, w, step_w):
-            if i + step_h <= h and j + step_w <= w:
-                avg_temp = np.mean(temp_data[i:i+step_h, j:j+step_w])
-                if avg_temp > 30:
-                    row += "🔥"
-                elif avg_temp > 27:
-                    row += "🟠"
-                elif avg_temp > 24:
-                    row += "🟡"
-                elif avg_temp > 22:
-                    row += "🟢"
-                else:
-                    row += "🔵"
-            else:
-                row += "⚫"
+    full_rows, full_cols = h // step_h, w // step_w
+    tiles = temp_data[:full_rows * step_h, :full_cols * step_w].reshape(full_rows, step_h, full_cols, step_w)
+    avg_temps = tiles.mean(axis=(1, 3))
+    symbols = np.select(
+        [avg_temps > 30, avg_temps > 27, avg_temps > 24, avg_temps > 22],
+        ["🔥", "🟠", "🟡", "🟢"],
+        default="🔵"
+    )
+    
+    # Tiles cut off by the image border are shown as ⚫
+    rows, cols = -(-h // step_h), -(-w // step_w)
+    for i in range(rows):
+        row = "".join(symbols[i]) if i < full_rows else ""
+        row += "⚫" * (cols - len(row))
         print(f"   {row}")
     
     print(f"\n🔥 Legend: 🔥>30°C 🟠27-30°C 🟡24-27°C 🟢22-24°C 🔵<22°C")
@@ -212,12 +206,11 @@ if __name__ == "__main__":
     print("🔥 ANYmal Thermal Image Viewer")
     print("=" * 50)
     
-    # Check if matplotlib is available for advanced viewing
-    try:
-        import matplotlib.pyplot as plt
+    # Check if matplotlib is available for advanced viewing, without importing it yet
+    if importlib.util.find_spec("matplotlib") is not None:
         print("📊 Creating detailed thermal analysis...")
         view_thermal_images()
-    except ImportError:
+    else:
         print("⚠️  Matplotlib not available. Using basic viewer...")
         create_thermal_summary()
         open_images_with_system_viewer()